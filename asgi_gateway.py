@@ -0,0 +1,379 @@
+"""Gateway ASGI untuk ingest sensor dan gambar dari banyak perangkat sekaligus.
+
+URL, header X-API-KEY dan bentuk response sama dengan flask_app.py untuk
+POST /api/sensor, POST /api/sensor/batch dan POST /upload. Satu event loop
+menahan banyak koneksi perangkat yang lambat (Wi-Fi sekolah) tanpa menahan
+worker: data sensor ditulis lewat AsyncMongoClient, body gambar ditulis ke
+file sementara per chunk, lalu decode/pemeriksaan/penyimpanan gambar
+dijalankan di thread pool dengan kode yang sama seperti flask_app.
+
+    uvicorn asgi_gateway:app --host 0.0.0.0 --port 5002
+
+Endpoint lain tetap dilayani flask_app lewat wsgi.py (mode multi-worker, agar
+/api/sensor/latest dan index gambar ikut membaca data dari gateway). Arahkan
+ketiga URL ingest ke gateway dari reverse proxy.
+"""
+import asyncio
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from limits import parse_many
+from limits.aio.strategies import SlidingWindowCounterRateLimiter
+from limits.errors import ConfigurationError
+from limits.storage import storage_from_string
+from pymongo import AsyncMongoClient
+from werkzeug.datastructures import Headers
+from werkzeug.exceptions import RequestEntityTooLarge
+from werkzeug.http import parse_options_header
+from werkzeug.sansio.multipart import Data, Epilogue, File, MultipartDecoder, NeedData
+
+import flask_app
+from flask_app import (INGEST_RATE_LIMIT, MAX_BATCH_SIZE, MAX_IMAGE_BYTES, MULTIPART_OVERHEAD,
+                       SENSOR_CONTENT_TYPE, UPLOAD_FOLDER, UPLOAD_RATE_LIMIT, build_sensor_document,
+                       decode_sensor_payload, has_required_fields, rate_limit_identity,
+                       record_rate_limit_rejection, validate_api_key)
+from sensor_rollups import apply_rollups_async
+from sensor_storage import create_sensor_store
+from upload_spool import SpooledUpload
+
+# ========== KONFIGURASI GATEWAY ==========
+JSON_BODY_LIMIT = 1024 * 1024  # Batas body /api/sensor dan /api/sensor/batch
+UPLOAD_WORKERS = 4             # Thread untuk decode/pemeriksaan/penyimpanan gambar
+
+logger = flask_app.app.logger
+
+# Diisi startup()
+client = None
+sensor_store = None
+rollup_collection = None
+rate_limiter = None
+upload_executor = None
+
+# Kuota sama dengan flask_app, per perangkat: /api/sensor dan /api/sensor/batch
+# berbagi kuota 'ingest', /upload memakai kuota 'upload'
+RATE_LIMITS = {
+    '/api/sensor': ("ingest", parse_many(INGEST_RATE_LIMIT)),
+    '/api/sensor/batch': ("ingest", parse_many(INGEST_RATE_LIMIT)),
+    '/upload': ("upload", parse_many(UPLOAD_RATE_LIMIT))
+}
+
+
+class ClientDisconnected(Exception):
+    pass
+
+
+# ========== FUNGSI BANTUAN ==========
+async def iter_body(receive):
+    """Chunk body request sesuai kecepatan client, tanpa menahan thread"""
+    while True:
+        message = await receive()
+        if message['type'] == 'http.disconnect':
+            raise ClientDisconnected()
+        chunk = message.get('body', b'')
+        if chunk:
+            yield chunk
+        if not message.get('more_body'):
+            return
+
+async def read_sensor_payload(receive, headers, single=False):
+    """Body request sensor: JSON (None jika tidak valid), atau format biner jika
+    Content-Type SENSOR_CONTENT_TYPE (ValueError jika tidak valid)"""
+    body = bytearray()
+    async for chunk in iter_body(receive):
+        body += chunk
+        if len(body) > JSON_BODY_LIMIT:
+            raise RequestEntityTooLarge()
+    mimetype, _ = parse_options_header(headers.get('Content-Type', ''))
+    if mimetype == SENSOR_CONTENT_TYPE:
+        return decode_sensor_payload(bytes(body), headers.get('X-Device-ID'), single)
+    try:
+        return json.loads(body)
+    except ValueError:
+        return None
+
+async def spool_multipart(receive, boundary, upload):
+    """Tulis part file 'image' dari body multipart ke SpooledUpload"""
+    decoder = MultipartDecoder(boundary.encode(), max_form_memory_size=MULTIPART_OVERHEAD)
+    writing = False
+    found = False
+
+    async def drain():
+        nonlocal writing, found
+        pending = []
+        event = decoder.next_event()
+        while not isinstance(event, (NeedData, Epilogue)):
+            if isinstance(event, File) and event.name == 'image' and not found:
+                writing = found = True
+            elif isinstance(event, Data):
+                if writing:
+                    pending.append(event.data)
+                    if not event.more_data:
+                        writing = False
+            else:
+                writing = False
+            event = decoder.next_event()
+        if pending:
+            await asyncio.to_thread(upload.write, b"".join(pending))
+
+    async for chunk in iter_body(receive):
+        decoder.receive_data(chunk)
+        await drain()
+    decoder.receive_data(None)
+    await drain()
+
+async def receive_upload(receive, content_type):
+    """Terima body upload (multipart field 'image' atau JPEG mentah) ke file sementara"""
+    mimetype, options = parse_options_header(content_type)
+    upload = SpooledUpload(UPLOAD_FOLDER, MAX_IMAGE_BYTES)
+    try:
+        if mimetype == 'multipart/form-data':
+            await spool_multipart(receive, options.get('boundary', ''), upload)
+        else:
+            async for chunk in iter_body(receive):
+                await asyncio.to_thread(upload.write, chunk)
+        await asyncio.to_thread(upload.flush)
+    except BaseException:
+        upload.discard()
+        raise
+    return upload
+
+def process_upload(upload, device_id):
+    """Jalankan pipeline upload flask_app di thread pool"""
+    try:
+        flask_app.sync_frame_index()
+        return flask_app.store_upload(upload, device_id)
+    finally:
+        upload.discard()  # Tidak berpengaruh jika file sudah dipindahkan ke lokasi akhir
+
+async def after_sensor_saved(documents):
+    """Perbarui rollup setelah dokumen sensor berhasil disimpan"""
+    try:
+        await apply_rollups_async(rollup_collection, documents)
+    except Exception as e:
+        logger.error(f"Gagal memperbarui rollup sensor: {str(e)}")
+
+async def check_rate_limit(path, headers, remote_addr):
+    """Return (limit yang terlampaui, header response 429), atau None"""
+    if rate_limiter is None or path not in RATE_LIMITS:
+        return None
+    budget, items = RATE_LIMITS[path]
+    key = rate_limit_identity(headers, remote_addr)
+    for item in items:
+        if not await rate_limiter.hit(item, budget, key):
+            record_rate_limit_rejection(budget, key)
+            window = await rate_limiter.get_window_stats(item, budget, key)
+            return item, rate_limit_headers(item, window)
+    return None
+
+def rate_limit_headers(item, window):
+    """Header X-RateLimit-* dan Retry-After, dihitung seperti flask_limiter"""
+    reset_at = int(window.reset_time + 1)
+    return [
+        (b'x-ratelimit-limit', str(item.amount).encode()),
+        (b'x-ratelimit-remaining', str(window.remaining).encode()),
+        (b'x-ratelimit-reset', str(reset_at).encode()),
+        (b'retry-after', str(int(reset_at - time.time())).encode())
+    ]
+
+async def send_json(send, payload, status, headers=()):
+    body = json.dumps(payload).encode()
+    await send({
+        'type': 'http.response.start',
+        'status': status,
+        'headers': [(b'content-type', b'application/json'), (b'content-length', str(len(body)).encode()),
+                    *headers]
+    })
+    await send({'type': 'http.response.body', 'body': body})
+
+
+# ========== ROUTE ==========
+async def receive_sensor_data(receive, headers):
+    if not validate_api_key(headers, "sensor"):
+        logger.warning("Unauthorized access attempt to sensor endpoint")
+        return {"status": "error", "message": "Unauthorized"}, 401
+
+    try:
+        data = await read_sensor_payload(receive, headers, single=True)
+    except ValueError as e:
+        return {"status": "error", "message": str(e)}, 400
+    if not has_required_fields(data):
+        return {"status": "error", "message": "Missing fields"}, 400
+
+    sensor_data = build_sensor_document(data)
+    failed = await sensor_store.insert_many_async([sensor_data])
+    if failed:
+        raise RuntimeError(failed[0])
+    await after_sensor_saved([sensor_data])
+
+    logger.info(f"Data sensor saved: {sensor_data['_id']}")
+    return {
+        "status": "success",
+        "message": "Data saved",
+        "id": str(sensor_data['_id'])
+    }, 201
+
+async def receive_sensor_batch(receive, headers):
+    """Terima banyak data sensor sekaligus dan simpan dengan satu bulk write"""
+    if not validate_api_key(headers, "sensor"):
+        logger.warning("Unauthorized access attempt to sensor batch endpoint")
+        return {"status": "error", "message": "Unauthorized"}, 401
+
+    try:
+        readings = await read_sensor_payload(receive, headers)
+    except ValueError as e:
+        return {"status": "error", "message": str(e)}, 400
+    if not isinstance(readings, list) or not readings:
+        return {"status": "error", "message": "Expected a non-empty array of readings"}, 400
+    if len(readings) > MAX_BATCH_SIZE:
+        return {"status": "error", "message": f"Batch exceeds {MAX_BATCH_SIZE} readings"}, 413
+
+    # Validasi setiap data, simpan hasil per item sesuai urutan input
+    results = [None] * len(readings)
+    documents = []
+    positions = []  # Posisi dokumen di array input
+    for index, data in enumerate(readings):
+        if not has_required_fields(data):
+            results[index] = {"index": index, "status": "error", "message": "Missing fields"}
+            continue
+        documents.append(build_sensor_document(data))
+        positions.append(index)
+
+    failed = await sensor_store.insert_many_async(documents) if documents else {}
+    saved_documents = [doc for i, doc in enumerate(documents) if i not in failed]
+    if saved_documents:
+        await after_sensor_saved(saved_documents)
+
+    for doc_index, (position, document) in enumerate(zip(positions, documents)):
+        if doc_index in failed:
+            results[position] = {"index": position, "status": "error", "message": failed[doc_index]}
+        else:
+            results[position] = {"index": position, "status": "success", "id": str(document['_id'])}
+
+    saved = sum(1 for r in results if r["status"] == "success")
+    logger.info(f"Batch sensor saved: {saved}/{len(readings)}")
+    return {
+        "status": "success" if saved == len(readings) else "partial",
+        "saved": saved,
+        "failed": len(readings) - saved,
+        "results": results
+    }, 201 if saved == len(readings) else 207
+
+async def upload_image(receive, headers):
+    if not validate_api_key(headers, "camera"):
+        logger.warning("Unauthorized access attempt to camera endpoint")
+        return {"status": "error", "message": "Unauthorized"}, 401
+
+    # Tolak lebih awal jika Content-Length sudah melebihi batas
+    content_length = headers.get('Content-Length', type=int)
+    if content_length and content_length > MAX_IMAGE_BYTES + MULTIPART_OVERHEAD:
+        logger.error("Ukuran gambar melebihi 5MB")
+        return {"status": "error", "message": "Ukuran gambar melebihi 5MB"}, 413
+
+    try:
+        upload = await receive_upload(receive, headers.get('Content-Type', ''))
+    except RequestEntityTooLarge:
+        logger.error("Ukuran gambar melebihi 5MB")
+        return {"status": "error", "message": "Ukuran gambar melebihi 5MB"}, 413
+
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(upload_executor, process_upload, upload, headers.get('X-Device-ID'))
+
+ROUTES = {
+    ('POST', '/api/sensor'): receive_sensor_data,
+    ('POST', '/api/sensor/batch'): receive_sensor_batch,
+    ('POST', '/upload'): upload_image
+}
+
+
+# ========== APLIKASI ASGI ==========
+async def startup(config=None, mongo_client=None):
+    """Siapkan state flask_app (index gambar, ledger) dan koneksi MongoDB async.
+    `mongo_client` bisa diisi client pengganti, mis. untuk pengujian."""
+    global client, sensor_store, rollup_collection, rate_limiter, upload_executor
+    # Gateway tidak melayani /api/stream, data sensor tidak perlu dibaca ulang dari database
+    flask_app.create_app({"MULTI_PROCESS": True, "SENSOR_POLL_INTERVAL": 0, **(config or {})})
+    settings = flask_app.app.config
+    client = mongo_client or AsyncMongoClient(
+        settings["MONGO_URI"],
+        maxPoolSize=settings["MONGO_MAX_POOL_SIZE"],
+        minPoolSize=settings["MONGO_MIN_POOL_SIZE"],
+        connectTimeoutMS=settings["MONGO_CONNECT_TIMEOUT_MS"],
+        serverSelectionTimeoutMS=settings["MONGO_SERVER_SELECTION_TIMEOUT_MS"],
+        socketTimeoutMS=settings["MONGO_SOCKET_TIMEOUT_MS"]
+    )
+    db = client.get_default_database('edunudge_db')  # Nama database dari MONGO_URI
+    sensor_store = create_sensor_store(db, flask_app.SENSOR_STORAGE_MODE)
+    rollup_collection = db['sensor_rollups']
+    if settings.get('RATELIMIT_ENABLED', True):
+        storage_uri = settings.get('RATELIMIT_STORAGE_URI', 'memory://')
+        try:
+            storage = storage_from_string(f"async+{storage_uri}", **settings.get('RATELIMIT_STORAGE_OPTIONS', {}))
+        except ConfigurationError as e:
+            # Mis. storage MongoDB async butuh paket motor. Jangan pindah ke memori diam-diam:
+            # kuota gateway tidak lagi dibagi dengan wsgi.py dan proses gateway lain
+            raise RuntimeError(f"Storage rate limit {storage_uri.split(':', 1)[0]} tidak tersedia "
+                               f"untuk gateway: {str(e)}") from e
+        rate_limiter = SlidingWindowCounterRateLimiter(storage)
+    upload_executor = ThreadPoolExecutor(max_workers=UPLOAD_WORKERS, thread_name_prefix="upload")
+
+async def shutdown():
+    global client
+    if upload_executor is not None:
+        upload_executor.shutdown(wait=True)
+    if client is not None:
+        await client.close()
+        client = None
+    flask_app.derivatives.stop()
+    flask_app.close_database()
+
+async def lifespan(receive, send):
+    while True:
+        message = await receive()
+        if message['type'] == 'lifespan.startup':
+            try:
+                await startup()
+            except Exception as e:
+                logger.error(f"Gateway gagal dijalankan: {str(e)}")
+                await send({'type': 'lifespan.startup.failed', 'message': str(e)})
+                return
+            await send({'type': 'lifespan.startup.complete'})
+        elif message['type'] == 'lifespan.shutdown':
+            await shutdown()
+            await send({'type': 'lifespan.shutdown.complete'})
+            return
+
+async def app(scope, receive, send):
+    if scope['type'] == 'lifespan':
+        await lifespan(receive, send)
+        return
+    if scope['type'] != 'http':
+        return
+
+    path = scope['path']
+    handler = ROUTES.get((scope['method'], path))
+    if handler is None:
+        if any(route_path == path for _, route_path in ROUTES):
+            await send_json(send, {"status": "error", "message": "Method not allowed"}, 405)
+        else:
+            await send_json(send, {"status": "error", "message": "Not found"}, 404)
+        return
+
+    remote_addr = scope['client'][0] if scope.get('client') else '127.0.0.1'
+    headers = Headers([(key.decode('latin-1'), value.decode('latin-1')) for key, value in scope['headers']])
+    exceeded = await check_rate_limit(path, headers, remote_addr)
+    if exceeded is not None:
+        item, limit_headers = exceeded
+        await send_json(send, {"status": "error", "message": f"Rate limit exceeded: {item}"}, 429, limit_headers)
+        return
+
+    try:
+        result, status = await handler(receive, headers)
+    except ClientDisconnected:
+        return  # Perangkat putus sebelum body selesai dikirim
+    except RequestEntityTooLarge:
+        result, status = {"status": "error", "message": "Request body too large"}, 413
+    except Exception as e:
+        logger.error(f"Error processing {path}: {str(e)}")
+        result, status = {"status": "error", "message": str(e)}, 500
+    await send_json(send, result, status)
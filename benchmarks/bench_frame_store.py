@@ -0,0 +1,87 @@
+"""Benchmark penyimpanan frame: satu file per frame vs segment store append-only.
+
+Mengukur throughput tulis (frame/detik) dan biaya retensi saat penyimpanan penuh:
+layout file menghapus file tertua satu per satu (StorageLedger.evict), sedangkan
+segment store menghapus segment tertua utuh (SegmentStore.enforce_retention).
+
+    python benchmarks/bench_frame_store.py --frames 3000 --frame-kb 30
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from frame_layout import build_frame_name  # noqa: E402
+from segment_store import SegmentStore  # noqa: E402
+from storage_ledger import StorageLedger  # noqa: E402
+
+
+def write_files(folder, data, frames):
+    """Tulis frame seperti upload_image mode 'files'. Return (detik tulis, ledger)"""
+    ledger = StorageLedger(folder, len(data) * frames)
+    started = datetime(2024, 1, 1)
+    begin = time.perf_counter()
+    for i in range(frames):
+        # Satu frame per detik agar folder shard per jam ikut terbentuk
+        filepath = os.path.join(folder, build_frame_name(None, started + timedelta(seconds=i), i))
+        os.makedirs(os.path.dirname(filepath), exist_ok=True)
+        with open(filepath, 'wb') as f:
+            f.write(data)
+        stat = os.stat(filepath)
+        ledger.add(filepath, stat.st_size, stat.st_mtime)
+    return time.perf_counter() - begin, ledger
+
+
+def write_segments(folder, data, frames, segment_size):
+    """Tulis frame ke segment store. Return (detik tulis, store)"""
+    store = SegmentStore(folder, segment_size, len(data) * frames)
+    store.open()
+    begin = time.perf_counter()
+    for i in range(frames):
+        store.append(data, len(data), time.time())
+    return time.perf_counter() - begin, store
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--frames', type=int, default=3000)
+    parser.add_argument('--frame-kb', type=int, default=30, help="Ukuran satu frame (KB)")
+    parser.add_argument('--segment-mb', type=int, default=16)
+    parser.add_argument('--evict-ratio', type=float, default=0.5,
+                        help="Batas penyimpanan baru relatif terhadap data yang ditulis")
+    args = parser.parse_args()
+
+    data = os.urandom(args.frame_kb * 1024)
+    total_mb = len(data) * args.frames / (1024 * 1024)
+    print(f"{args.frames} frame x {args.frame_kb}KB ({total_mb:.1f}MB), segment {args.segment_mb}MB\n")
+    print(f"{'layout':<10}{'frame/detik':>13}{'evict ms':>11}{'dihapus':>10}{'file tersisa':>14}")
+
+    with tempfile.TemporaryDirectory() as folder:
+        elapsed, ledger = write_files(folder, data, args.frames)
+        # Turunkan batas agar retensi menghapus sebagian besar data
+        ledger.max_bytes = int(ledger.total_bytes * args.evict_ratio)
+        begin = time.perf_counter()
+        evicted = ledger.evict()
+        evict_ms = (time.perf_counter() - begin) * 1000
+        remaining = sum(len(files) for _, _, files in os.walk(folder))
+        print(f"{'files':<10}{args.frames / elapsed:>13.0f}{evict_ms:>11.1f}"
+              f"{len(evicted):>10}{remaining:>14}")
+
+    with tempfile.TemporaryDirectory() as folder:
+        elapsed, store = write_segments(folder, data, args.frames, args.segment_mb * 1024 * 1024)
+        store.max_bytes = int(store.total_bytes * args.evict_ratio)
+        before = len(store)
+        begin = time.perf_counter()
+        store.enforce_retention()
+        evict_ms = (time.perf_counter() - begin) * 1000
+        remaining = len(os.listdir(folder))
+        print(f"{'segments':<10}{args.frames / elapsed:>13.0f}{evict_ms:>11.1f}"
+              f"{before - len(store):>10}{remaining:>14}")
+        store.clear()
+
+
+if __name__ == '__main__':
+    main()
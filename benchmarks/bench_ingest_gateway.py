@@ -0,0 +1,120 @@
+"""Benchmark koneksi bersamaan: gateway ASGI vs app WSGI (gunicorn).
+
+Mensimulasikan banyak ESP32 di Wi-Fi lambat: setiap client membuka koneksi,
+mengirim header, menunggu --client-delay detik lalu mengirim body
+POST /api/sensor. Server WSGI menahan satu thread per koneksi selama itu,
+gateway ASGI hanya menahan coroutine. Rate limit dimatikan lewat
+EDUNUDGE_RATELIMIT_ENABLED. Membutuhkan MongoDB, gunicorn dan uvicorn.
+
+    python benchmarks/bench_ingest_gateway.py --mongo-uri mongodb://localhost:27017/edunudge_bench \\
+        --connections 50,200,500 --client-delay 0.5
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+API_KEY = "EduNudgeAI"
+
+SERVERS = {
+    "wsgi": lambda port: [sys.executable, "-m", "gunicorn", "-c", "gunicorn.conf.py", "wsgi:app"],
+    "asgi": lambda port: [sys.executable, "-m", "uvicorn", "asgi_gateway:app",
+                          "--host", "127.0.0.1", "--port", str(port), "--no-access-log"]
+}
+
+
+def start_server(kind, port, args):
+    env = dict(os.environ,
+               EDUNUDGE_WORKERS=str(args.workers),
+               EDUNUDGE_THREADS=str(args.threads),
+               EDUNUDGE_BIND=f"127.0.0.1:{port}",
+               EDUNUDGE_MONGO_URI=args.mongo_uri,
+               EDUNUDGE_RATELIMIT_ENABLED="false")
+    process = subprocess.Popen(SERVERS[kind](port), cwd=ROOT, env=env,
+                               stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    deadline = time.time() + 20
+    while time.time() < deadline:
+        try:
+            status, _ = asyncio.run(post_reading("127.0.0.1", port, 0))
+            if status:
+                return process
+        except OSError:
+            time.sleep(0.2)
+    process.terminate()
+    raise RuntimeError(f"Server {kind} tidak merespons")
+
+
+async def post_reading(host, port, delay):
+    """Satu POST /api/sensor dengan body dikirim setelah `delay` detik. Return (status, detik)"""
+    body = json.dumps({
+        "temp": round(random.uniform(22, 32), 1),
+        "hum": round(random.uniform(40, 80), 1),
+        "light": round(random.uniform(0, 100), 1),
+        "motion": random.randint(0, 1),
+        "sound": round(random.uniform(30, 90), 1)
+    }).encode()
+    started = time.perf_counter()
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        writer.write((
+            f"POST /api/sensor HTTP/1.1\r\nHost: {host}\r\nX-API-KEY: {API_KEY}\r\n"
+            f"Content-Type: application/json\r\nContent-Length: {len(body)}\r\nConnection: close\r\n\r\n"
+        ).encode())
+        await writer.drain()
+        await asyncio.sleep(delay)
+        writer.write(body)
+        await writer.drain()
+        status_line = await reader.readline()
+        await reader.read()
+    finally:
+        writer.close()
+    status = int(status_line.split()[1]) if status_line else 0
+    return status, time.perf_counter() - started
+
+
+async def run_load(port, connections, delay, timeout):
+    async def one():
+        try:
+            return await asyncio.wait_for(post_reading("127.0.0.1", port, delay), timeout)
+        except (asyncio.TimeoutError, OSError):
+            return 0, timeout
+    begin = time.perf_counter()
+    results = await asyncio.gather(*(one() for _ in range(connections)))
+    return time.perf_counter() - begin, results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--mongo-uri', default="mongodb://localhost:27017/edunudge_bench")
+    parser.add_argument('--connections', default="50,200,500", help="Jumlah koneksi bersamaan, dipisah koma")
+    parser.add_argument('--client-delay', type=float, default=0.5, help="Jeda sebelum body dikirim (detik)")
+    parser.add_argument('--timeout', type=float, default=30.0)
+    parser.add_argument('--workers', type=int, default=2, help="Worker gunicorn untuk server WSGI")
+    parser.add_argument('--threads', type=int, default=8, help="Thread per worker gunicorn")
+    parser.add_argument('--port', type=int, default=5098)
+    args = parser.parse_args()
+
+    print(f"{'server':<7}{'koneksi':>9}{'req/s':>9}{'p50 ms':>9}{'p95 ms':>9}{'gagal':>7}")
+    for kind in SERVERS:
+        process = start_server(kind, args.port, args)
+        try:
+            for connections in [int(value) for value in args.connections.split(',')]:
+                duration, results = asyncio.run(run_load(args.port, connections, args.client_delay, args.timeout))
+                latencies = sorted(elapsed for _, elapsed in results)
+                failed = sum(1 for status, _ in results if status != 201)
+                p50 = statistics.median(latencies) * 1000
+                p95 = latencies[int(len(latencies) * 0.95) - 1] * 1000
+                print(f"{kind:<7}{connections:>9}{connections / duration:>9.0f}{p50:>9.1f}{p95:>9.1f}{failed:>7}")
+        finally:
+            process.terminate()
+            process.wait()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,98 @@
+"""Benchmark ingest sensor dengan 1, 2 dan 4 worker gunicorn.
+
+Menjalankan wsgi:app dengan jumlah worker berbeda, lalu mengirim POST
+/api/sensor secara paralel dan mencatat throughput serta latency p50/p95.
+Rate limit dimatikan lewat EDUNUDGE_RATELIMIT_ENABLED. Membutuhkan MongoDB
+yang berjalan dan gunicorn terpasang.
+
+    python benchmarks/bench_ingest_workers.py --mongo-uri mongodb://localhost:27017/edunudge_bench
+"""
+import argparse
+import os
+import random
+import statistics
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+API_KEY = "EduNudgeAI"
+
+
+def start_server(workers, port, mongo_uri):
+    env = dict(os.environ,
+               EDUNUDGE_WORKERS=str(workers),
+               EDUNUDGE_BIND=f"127.0.0.1:{port}",
+               EDUNUDGE_MONGO_URI=mongo_uri,
+               EDUNUDGE_RATELIMIT_ENABLED="false")
+    process = subprocess.Popen([sys.executable, "-m", "gunicorn", "-c", "gunicorn.conf.py", "wsgi:app"],
+                               cwd=ROOT, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    url = f"http://127.0.0.1:{port}"
+    for _ in range(100):
+        try:
+            requests.get(f"{url}/api/sensor/latest", timeout=1)
+            return process, url
+        except requests.ConnectionError:
+            time.sleep(0.2)
+    process.terminate()
+    raise RuntimeError("Server gunicorn tidak merespons")
+
+
+def send_reading(session, url, device):
+    payload = {
+        "device_id": device,
+        "temp": round(random.uniform(22, 32), 1),
+        "hum": round(random.uniform(40, 80), 1),
+        "light": round(random.uniform(0, 100), 1),
+        "motion": random.randint(0, 1),
+        "sound": round(random.uniform(30, 90), 1)
+    }
+    started = time.perf_counter()
+    response = session.post(f"{url}/api/sensor", json=payload, headers={"X-API-KEY": API_KEY})
+    elapsed = time.perf_counter() - started
+    return response.status_code, elapsed
+
+
+def run_load(url, requests_total, concurrency):
+    """Kirim `requests_total` data dengan `concurrency` client. Return (detik, latency, gagal)"""
+    sessions = [requests.Session() for _ in range(concurrency)]
+    begin = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        results = list(executor.map(
+            lambda i: send_reading(sessions[i % concurrency], url, f"bench-{i % 20}"),
+            range(requests_total)
+        ))
+    duration = time.perf_counter() - begin
+    latencies = sorted(elapsed for _, elapsed in results)
+    failed = sum(1 for status, _ in results if status not in (200, 201, 202))
+    return duration, latencies, failed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--mongo-uri', default="mongodb://localhost:27017/edunudge_bench")
+    parser.add_argument('--workers', default="1,2,4", help="Daftar jumlah worker, dipisah koma")
+    parser.add_argument('--requests', type=int, default=5000)
+    parser.add_argument('--concurrency', type=int, default=32)
+    parser.add_argument('--port', type=int, default=5099)
+    args = parser.parse_args()
+
+    print(f"{'worker':>7}{'req/s':>10}{'p50 ms':>9}{'p95 ms':>9}{'gagal':>7}")
+    for workers in [int(value) for value in args.workers.split(',')]:
+        process, url = start_server(workers, args.port, args.mongo_uri)
+        try:
+            run_load(url, min(200, args.requests), args.concurrency)  # Pemanasan pool koneksi
+            duration, latencies, failed = run_load(url, args.requests, args.concurrency)
+        finally:
+            process.terminate()
+            process.wait()
+        p50 = statistics.median(latencies) * 1000
+        p95 = latencies[int(len(latencies) * 0.95) - 1] * 1000
+        print(f"{workers:>7}{args.requests / duration:>10.0f}{p50:>9.1f}{p95:>9.1f}{failed:>7}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,101 @@
+"""Benchmark format payload sensor: JSON vs format biner ringkas (sensor_codec).
+
+Tanpa --url hanya mengukur ukuran payload dan biaya parse + validasi di server
+(tanpa database). Dengan --url, juga mengirim POST /api/sensor ke server yang
+berjalan dan mencatat request/detik per format; jalankan server dengan
+EDUNUDGE_RATELIMIT_ENABLED=false agar tidak terkena rate limit.
+
+    python benchmarks/bench_sensor_payload.py
+    python benchmarks/bench_sensor_payload.py --url http://localhost:5001 --requests 5000
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from sensor_codec import CONTENT_TYPE, decode_readings, encode_reading  # noqa: E402
+
+REQUIRED_SENSOR_FIELDS = ['temp', 'hum', 'light', 'motion', 'sound']
+API_KEY = "EduNudgeAI"
+
+
+def random_reading():
+    return (random.randint(20, 34), random.randint(40, 90), round(random.uniform(0, 100), 1),
+            random.randint(0, 1), round(random.uniform(0, 100), 1))
+
+
+def json_payload(temp, hum, light, motion, sound):
+    """Payload seperti send_to_mongodb di firmware"""
+    return json.dumps({
+        "temp": temp, "hum": hum, "light": light, "motion": motion, "sound": sound,
+        "timestamp": "2025-01-06 07:00:00", "device": "ESP32-Sensor"
+    }).encode()
+
+
+def parse_json(body):
+    data = json.loads(body)
+    return isinstance(data, dict) and all(field in data for field in REQUIRED_SENSOR_FIELDS)
+
+
+def parse_binary(body):
+    data = decode_readings(body)[0]
+    return all(field in data for field in REQUIRED_SENSOR_FIELDS)
+
+
+FORMATS = {
+    "json": ("application/json", json_payload, parse_json),
+    "binary": (CONTENT_TYPE, lambda *values: encode_reading(*values), parse_binary)
+}
+
+
+def bench_parse(count):
+    readings = [random_reading() for _ in range(count)]
+    print(f"{'format':<8}{'byte/data':>11}{'parse us':>10}")
+    for name, (_, encode, parse) in FORMATS.items():
+        bodies = [encode(*reading) for reading in readings]
+        started = time.perf_counter()
+        for body in bodies:
+            parse(body)
+        elapsed = time.perf_counter() - started
+        size = sum(len(body) for body in bodies) / count
+        print(f"{name:<8}{size:>11.1f}{elapsed / count * 1e6:>10.2f}")
+
+
+def bench_http(url, count, concurrency):
+    import requests
+    print(f"\n{'format':<8}{'req/s':>10}{'gagal':>7}")
+    for name, (content_type, encode, _) in FORMATS.items():
+        bodies = [encode(*random_reading()) for _ in range(count)]
+        sessions = [requests.Session() for _ in range(concurrency)]
+        headers = {"Content-Type": content_type, "X-API-KEY": API_KEY}
+
+        def post(i):
+            return sessions[i % concurrency].post(f"{url}/api/sensor", data=bodies[i], headers=headers).status_code
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            statuses = list(executor.map(post, range(count)))
+        elapsed = time.perf_counter() - started
+        failed = sum(1 for status in statuses if status != 201)
+        print(f"{name:<8}{count / elapsed:>10.0f}{failed:>7}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--count', type=int, default=100000, help="Jumlah payload untuk benchmark parse")
+    parser.add_argument('--url', help="URL server Flask/gateway, mis. http://localhost:5001")
+    parser.add_argument('--requests', type=int, default=2000)
+    parser.add_argument('--concurrency', type=int, default=16)
+    args = parser.parse_args()
+
+    bench_parse(args.count)
+    if args.url:
+        bench_http(args.url.rstrip('/'), args.requests, args.concurrency)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,104 @@
+"""Benchmark layout penyimpanan sensor: satu dokumen per data vs bucket.
+
+Membandingkan ukuran data, ukuran index dan waktu query (latest & rentang 1 jam)
+pada database sementara. Membutuhkan MongoDB yang berjalan.
+
+    python benchmarks/bench_sensor_storage.py --readings 200000 --devices 20
+"""
+import argparse
+import os
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+
+from pymongo import MongoClient
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from sensor_storage import DocumentSensorStore, BucketSensorStore  # noqa: E402
+
+
+def generate_readings(count, devices, interval=5):
+    """Data sintetis: setiap perangkat mengirim satu data tiap `interval` detik"""
+    start = datetime(2025, 1, 6, 7, 0, 0)
+    for i in range(count):
+        device_index = i % devices
+        yield {
+            "temp": round(random.uniform(22, 32), 1),
+            "hum": round(random.uniform(40, 80), 1),
+            "light": round(random.uniform(0, 100), 1),
+            "motion": random.randint(0, 1),
+            "sound": round(random.uniform(0, 100), 1),
+            "device": f"ESP32-Sensor-{device_index:02d}",
+            "device_type": "ESP32-Sensor",
+            "timestamp": start + timedelta(seconds=(i // devices) * interval)
+        }
+
+
+def load(store, readings, batch_size=5000):
+    batch = []
+    started = time.perf_counter()
+    for reading in readings:
+        batch.append(dict(reading))
+        if len(batch) >= batch_size:
+            store.insert_many(batch)
+            batch = []
+    if batch:
+        store.insert_many(batch)
+    return time.perf_counter() - started
+
+
+def range_query(store, start, end):
+    """Ambil semua data dalam rentang waktu"""
+    if isinstance(store, BucketSensorStore):
+        readings = []
+        for bucket in store.collection.find({"last_ts": {"$gte": start}, "first_ts": {"$lte": end}}):
+            readings.extend(r for r in store.unpack(bucket) if start <= r['timestamp'] <= end)
+        return readings
+    return list(store.collection.find({"timestamp": {"$gte": start, "$lte": end}}))
+
+
+def timed(func, repeat):
+    started = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return (time.perf_counter() - started) / repeat * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--uri', default="mongodb://localhost:27017")
+    parser.add_argument('--db', default='edunudge_bench')
+    parser.add_argument('--readings', type=int, default=100000)
+    parser.add_argument('--devices', type=int, default=10)
+    parser.add_argument('--repeat', type=int, default=50)
+    args = parser.parse_args()
+
+    client = MongoClient(args.uri)
+    client.drop_database(args.db)
+    db = client[args.db]
+
+    random.seed(42)
+    readings = list(generate_readings(args.readings, args.devices))
+    window_start = readings[len(readings) // 2]['timestamp']
+    window_end = window_start + timedelta(hours=1)
+
+    stores = [DocumentSensorStore(db['sensor_data']), BucketSensorStore(db['sensor_buckets'])]
+    print(f"{args.readings} data, {args.devices} perangkat\n")
+    print(f"{'layout':<10}{'load (s)':>10}{'docs':>10}{'data MB':>10}{'storage MB':>12}"
+          f"{'index MB':>10}{'latest ms':>11}{'range ms':>10}")
+    for store in stores:
+        store.ensure_indexes()
+        load_time = load(store, readings)
+        stats = db.command('collStats', store.collection.name)
+        latest_ms = timed(lambda: store.latest(10), args.repeat)
+        range_ms = timed(lambda: range_query(store, window_start, window_end), args.repeat)
+        print(f"{store.name:<10}{load_time:>10.2f}{stats['count']:>10}"
+              f"{stats['size'] / 2**20:>10.2f}{stats['storageSize'] / 2**20:>12.2f}"
+              f"{stats['totalIndexSize'] / 2**20:>10.2f}{latest_ms:>11.2f}{range_ms:>10.2f}")
+
+    client.drop_database(args.db)
+
+
+if __name__ == '__main__':
+    main()
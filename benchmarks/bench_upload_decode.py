@@ -0,0 +1,72 @@
+"""Benchmark CPU time per frame untuk upload gambar: decode+encode ulang vs passthrough.
+
+Membuat JPEG sintetis seukuran frame ESP32-CAM (default UXGA 1600x1200)
+lalu mengukur waktu CPU yang dipakai upload_image untuk setiap mode.
+
+    python benchmarks/bench_upload_decode.py --frames 50
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+import cv2
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from jpeg_utils import parse_jpeg_header  # noqa: E402
+
+
+def make_frame(width, height, quality=80):
+    """Frame sintetis dengan gradien dan noise agar ukurannya mirip foto kelas"""
+    gradient = np.linspace(0, 255, width, dtype=np.uint8)
+    img = np.tile(gradient, (height, 1))
+    img = cv2.merge([img, np.flipud(img), np.fliplr(img)])
+    noise = np.random.default_rng(42).integers(0, 40, img.shape, dtype=np.uint8)
+    ok, encoded = cv2.imencode('.jpg', cv2.add(img, noise), [cv2.IMWRITE_JPEG_QUALITY, quality])
+    return encoded.tobytes()
+
+
+def decode_mode(data, filepath):
+    img = cv2.imdecode(np.frombuffer(data, np.uint8), cv2.IMREAD_COLOR)
+    if img is None:
+        raise ValueError("Data gambar tidak valid")
+    cv2.imwrite(filepath, img)
+
+
+def passthrough_mode(data, filepath):
+    parse_jpeg_header(data)
+    with open(filepath, 'wb') as f:
+        f.write(data)
+
+
+def measure(func, data, frames, folder):
+    cpu_started = time.process_time()
+    wall_started = time.perf_counter()
+    for i in range(frames):
+        func(data, os.path.join(folder, f"frame_{i}.jpg"))
+    cpu = (time.process_time() - cpu_started) / frames * 1000
+    wall = (time.perf_counter() - wall_started) / frames * 1000
+    size = os.path.getsize(os.path.join(folder, "frame_0.jpg"))
+    return cpu, wall, size
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--width', type=int, default=1600)
+    parser.add_argument('--height', type=int, default=1200)
+    parser.add_argument('--frames', type=int, default=30)
+    args = parser.parse_args()
+
+    data = make_frame(args.width, args.height)
+    print(f"Frame {args.width}x{args.height}, {len(data) / 1024:.1f}KB, {args.frames} frame per mode\n")
+    print(f"{'mode':<14}{'CPU ms/frame':>14}{'wall ms/frame':>15}{'file KB':>10}")
+    for name, func in [("decode", decode_mode), ("passthrough", passthrough_mode)]:
+        with tempfile.TemporaryDirectory() as folder:
+            cpu, wall, size = measure(func, data, args.frames, folder)
+        print(f"{name:<14}{cpu:>14.2f}{wall:>15.2f}{size / 1024:>10.1f}")
+
+
+if __name__ == '__main__':
+    main()
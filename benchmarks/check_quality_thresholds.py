@@ -0,0 +1,114 @@
+"""Cek ambang pemeriksaan kualitas gambar terhadap set gambar berlabel.
+
+Tanpa --folder, set berlabel dibuat secara sintetis: adegan kelas bertekstur
+('good') dan turunannya yang digelapkan ('dark'), dibuat terlalu terang
+('overexposed') dan diburamkan ('blurry'). Dengan --folder, gambar diambil
+dari subfolder bernama label tersebut, mis. frames/dark/*.jpg.
+
+    python benchmarks/check_quality_thresholds.py
+    python benchmarks/check_quality_thresholds.py --folder frames --min-sharpness 80
+"""
+import argparse
+import glob
+import os
+import sys
+import time
+
+import cv2
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from frame_quality import DEFAULT_THRESHOLDS, assess_quality, load_preview_gray, measure_quality  # noqa: E402
+
+LABELS = ('good', 'dark', 'overexposed', 'blurry')
+
+
+def make_scene(rng, width=800, height=600):
+    """Adegan sintetis: latar bergradasi, bentuk bertepi tegas dan noise sensor"""
+    gradient = np.linspace(60, 190, width, dtype=np.float32)
+    img = np.tile(gradient, (height, 1))
+    img = cv2.merge([img, img * 0.9, img * 0.8]).astype(np.uint8)
+    for _ in range(25):
+        x, y = int(rng.integers(0, width - 80)), int(rng.integers(0, height - 80))
+        w, h = int(rng.integers(20, 160)), int(rng.integers(20, 160))
+        color = [float(c) for c in rng.integers(20, 235, 3)]
+        if rng.random() < 0.5:
+            cv2.rectangle(img, (x, y), (x + w, y + h), color, -1)
+        else:
+            cv2.circle(img, (x + w // 2, y + h // 2), min(w, h) // 2, color, -1)
+    for row in range(5):
+        cv2.putText(img, "EduNudge kelas 7A", (30, 80 + row * 110),
+                    cv2.FONT_HERSHEY_SIMPLEX, 1.4, (15, 15, 15), 3)
+    noisy = img.astype(np.float32) + rng.normal(0, 6, img.shape)
+    return np.clip(noisy, 0, 255).astype(np.uint8)
+
+
+def synthetic_set(count, seed=7):
+    """List (label, gambar BGR) berisi `count` gambar per label"""
+    rng = np.random.default_rng(seed)
+    samples = []
+    for _ in range(count):
+        scene = make_scene(rng)
+        samples.append(('good', scene))
+        dark_gain = rng.uniform(0.05, 0.25)
+        samples.append(('dark', cv2.convertScaleAbs(scene, alpha=dark_gain)))
+        samples.append(('overexposed', cv2.convertScaleAbs(scene, alpha=rng.uniform(1.8, 3.0), beta=80)))
+        kernel = int(rng.integers(7, 15)) * 2 + 1
+        samples.append(('blurry', cv2.GaussianBlur(scene, (kernel, kernel), 0)))
+    return samples
+
+
+def folder_set(folder):
+    samples = []
+    for label in LABELS:
+        for path in sorted(glob.glob(os.path.join(folder, label, '*.jpg'))):
+            img = cv2.imread(path, cv2.IMREAD_COLOR)
+            if img is not None:
+                samples.append((label, img))
+    return samples
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--folder', help="Folder berisi subfolder good/dark/overexposed/blurry")
+    parser.add_argument('--count', type=int, default=20, help="Jumlah gambar sintetis per label")
+    for key, value in DEFAULT_THRESHOLDS.items():
+        parser.add_argument(f"--{key.replace('_', '-')}", type=type(value), default=value)
+    args = parser.parse_args()
+    thresholds = {key: getattr(args, key) for key in DEFAULT_THRESHOLDS}
+
+    samples = folder_set(args.folder) if args.folder else synthetic_set(args.count)
+    if not samples:
+        print("Tidak ada gambar berlabel ditemukan")
+        return
+
+    print(f"Ambang: {thresholds}\n")
+    print(f"{'label':<13}{'jumlah':>8}{'benar':>8}{'sharpness':>11}{'brightness':>12}")
+    correct_total = 0
+    elapsed = 0.0
+    for label in LABELS:
+        rows = []
+        for sample_label, img in samples:
+            if sample_label != label:
+                continue
+            started = time.perf_counter()
+            metrics = measure_quality(load_preview_gray(None, img))
+            issues = assess_quality(metrics, thresholds)
+            elapsed += time.perf_counter() - started
+            # Gambar 'good' benar jika tanpa masalah, lainnya jika masalah yang sesuai terdeteksi
+            ok = not issues if label == 'good' else label in issues
+            rows.append((ok, metrics))
+        if not rows:
+            continue
+        correct = sum(ok for ok, _ in rows)
+        correct_total += correct
+        sharpness = np.median([m["sharpness"] for _, m in rows])
+        brightness = np.median([m["brightness"] for _, m in rows])
+        print(f"{label:<13}{len(rows):>8}{correct:>8}{sharpness:>11.1f}{brightness:>12.1f}")
+
+    print(f"\nAkurasi: {correct_total}/{len(samples)} "
+          f"({correct_total / len(samples) * 100:.1f}%), {elapsed / len(samples) * 1000:.2f} ms/gambar")
+
+
+if __name__ == '__main__':
+    main()
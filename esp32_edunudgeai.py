@@ -12,6 +12,13 @@ import socket
 import ujson
 import machine
 import gc
+import ubinascii
+
+try:
+    # Format biner ringkas untuk data sensor (upload juga sensor_codec.py ke ESP32)
+    from sensor_codec import encode_reading, CONTENT_TYPE as SENSOR_CONTENT_TYPE
+except ImportError:
+    encode_reading = None
 
 # ========== KONFIGURASI HARDWARE ==========
 # OLED Display
@@ -65,11 +72,15 @@ def read_config():
                 "server": "",
                 "token": "",
                 "device_label": "",
-                "topic": ""
+                "topic": "",
+                "user": "",
+                "password": ""
             },
             "api": {
                 "url": "",
-                "key": ""
+                "key": "",
+                "format": "json",
+                "device_id": ""
             }
         }
 
@@ -92,13 +103,27 @@ try:
     MQTT_TOKEN = config["mqtt"]["token"]
     DEVICE_LABEL = config["mqtt"]["device_label"]
     TOPIC = config["mqtt"]["topic"]
+    # Broker lokal (mqtt_bridge.py): satu user/password per perangkat, user = device_label.
+    # Jika kosong dipakai token Ubidots sebagai user (koneksi langsung ke Ubidots)
+    MQTT_USER = config["mqtt"].get("user") or MQTT_TOKEN
+    MQTT_PASSWORD = config["mqtt"].get("password", "")
 
     # MongoDB API Configuration - diambil dari file config
     FLASK_API_URL = config["api"]["url"]
     API_KEY = config["api"]["key"]
+    # Jika url dikosongkan, data tidak dikirim lewat HTTP: publish Ubidots (TOPIC) di
+    # broker lokal sudah disimpan mqtt_bridge.py, jadi setiap data cukup dikirim sekali
+    # "binary": kirim 10 byte per data (sensor_codec) alih-alih JSON
+    API_FORMAT = config["api"].get("format", "json")
+    # Nama perangkat; kuota rate limit server dihitung per X-Device-ID, jadi harus
+    # unik per ESP32 (mis. "kelas-7a"). Jika kosong dipakai ID chip (MAC)
+    API_DEVICE_ID = (config["api"].get("device_id")
+                     or "ESP32-Sensor-" + ubinascii.hexlify(machine.unique_id()).decode())
+    if API_FORMAT == "binary" and encode_reading is None:
+        raise ValueError("sensor_codec.py tidak ditemukan untuk format binary")
 
     # Validasi konfigurasi penting
-    if not all([MQTT_SERVER, MQTT_TOKEN, FLASK_API_URL]):
+    if not all([MQTT_SERVER, MQTT_USER]):
         raise ValueError("Konfigurasi penting kosong, periksa config.json")
 except Exception as e:
     print("Error inisialisasi konfigurasi:", e)
@@ -326,7 +351,8 @@ def connect_mqtt():
     """Menghubungkan ke broker MQTT"""
     global mqtt_client
     try:
-        mqtt_client = MQTTClient("ESP32_Client", MQTT_SERVER, user=MQTT_TOKEN, password="")
+        # Client ID harus unik per perangkat, broker memutus client lama dengan ID yang sama
+        mqtt_client = MQTTClient(DEVICE_LABEL or "ESP32_Client", MQTT_SERVER, user=MQTT_USER, password=MQTT_PASSWORD)
         mqtt_client.connect()
         print("MQTT Terhubung!")
         return True
@@ -349,7 +375,7 @@ def send_to_mongodb(temp, hum, light, motion, sound):
             "motion": motion,
             "sound": sound,
             "timestamp": timestamp,
-            "device": "ESP32-Sensor"
+            "device": API_DEVICE_ID
         }
         
         # Simpan data terakhir
@@ -362,8 +388,15 @@ def send_to_mongodb(temp, hum, light, motion, sound):
             "timestamp": timestamp
         }
         
-        headers = {"Content-Type": "application/json", "X-API-KEY": API_KEY}
-        response = urequests.post(FLASK_API_URL, json=payload, headers=headers)
+        if API_FORMAT == "binary":
+            body = encode_reading(temp, hum, light, motion, sound)
+            content_type = SENSOR_CONTENT_TYPE
+        else:
+            body = ujson.dumps(payload)
+            content_type = "application/json"
+        
+        headers = {"Content-Type": content_type, "X-API-KEY": API_KEY, "X-Device-ID": API_DEVICE_ID}
+        response = urequests.post(FLASK_API_URL, data=body, headers=headers)
         response.close()
         last_mongodb_send = time.time()
         print("MongoDB: Data sent")
@@ -376,7 +409,7 @@ def send_to_mongodb(temp, hum, light, motion, sound):
 
 def send_to_ubidots(temp, hum, light, motion, sound):
     """Mengirim data ke Ubidots melalui MQTT"""
-    global last_ubidots_send, mqtt_client, last_sensor_data
+    global last_ubidots_send, last_mongodb_send, mqtt_client, last_sensor_data
     
     if not mqtt_client and not connect_mqtt():
         return False
@@ -385,6 +418,8 @@ def send_to_ubidots(temp, hum, light, motion, sound):
         payload = f'{{"temp":{temp:.1f},"hum":{hum:.1f},"light":{light:.1f},"sound":{sound:.1f},"motion":{motion}}}'
         mqtt_client.publish(TOPIC, payload)
         last_ubidots_send = time.time()
+        if not FLASK_API_URL:
+            last_mongodb_send = last_ubidots_send  # Disimpan mqtt_bridge.py dari publish ini
         
         # Simpan data terakhir
         last_sensor_data = {
@@ -510,7 +545,7 @@ def main():
                 # Kirim data jika WiFi terhubung
                 current_time = time.time()
                 if wifi_connected:
-                    if current_time - last_mongodb_send > MONGODB_INTERVAL:
+                    if FLASK_API_URL and current_time - last_mongodb_send > MONGODB_INTERVAL:
                         if send_to_mongodb(temp, hum, light, motion, sound):
                             last_mongodb_send = current_time
                     
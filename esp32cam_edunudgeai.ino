@@ -11,6 +11,10 @@
 const char* ssid = "SSID-HD";
 const char* password = "123123123";
 const char* serverUrl = "https://edunudgeai.mantigamedan.sch.id/upload";
+// Kuota upload server dihitung per X-Device-ID, jadi harus unik per kamera.
+// Kosongkan agar diambil dari alamat MAC (esp32cam-<mac>)
+const char* configuredDeviceId = "";
+String deviceId;
 
 // Konfigurasi NTP
 const char* ntpServer = "pool.ntp.org";
@@ -119,6 +123,19 @@ void connectToWiFi() {
   Serial.println("\n✅ Terhubung ke WiFi!");
   Serial.print("Alamat IP: ");
   Serial.println(WiFi.localIP());
+
+  if (deviceId.length() == 0) {
+    if (strlen(configuredDeviceId) > 0) {
+      deviceId = configuredDeviceId;
+    } else {
+      String mac = WiFi.macAddress();
+      mac.replace(":", "");
+      mac.toLowerCase();
+      deviceId = "esp32cam-" + mac;
+    }
+    Serial.print("Device ID: ");
+    Serial.println(deviceId);
+  }
 }
 
 void setupCamera() {
@@ -340,6 +357,7 @@ void sendImageToServer(camera_fb_t* fb) {
   
   // API KEY
   http.addHeader("X-API-KEY", "edunudgeai");
+  http.addHeader("X-Device-ID", deviceId);
   http.addHeader("Content-Type", "multipart/form-data; boundary=" + boundary);
   http.addHeader("Content-Length", String(totalLength));
   
@@ -0,0 +1,79 @@
+import json
+import queue
+import threading
+from collections import deque
+
+
+class EventBroadcaster:
+    """Fan-out event ke semua subscriber Server-Sent Events (SSE).
+
+    Setiap event diberi id berurutan dan disimpan di replay buffer kecil,
+    sehingga client yang reconnect dengan header Last-Event-ID bisa
+    menerima event yang terlewat.
+    """
+
+    def __init__(self, replay_size=100, subscriber_queue_size=200):
+        self.replay = deque(maxlen=replay_size)
+        self.subscriber_queue_size = subscriber_queue_size
+        self._subscribers = set()
+        self._lock = threading.Lock()
+        self._next_id = 1
+
+    def publish(self, event, data):
+        """Kirim event ke semua subscriber"""
+        with self._lock:
+            message = (self._next_id, event, data)
+            self._next_id += 1
+            self.replay.append(message)
+            subscribers = list(self._subscribers)
+        for subscriber in subscribers:
+            try:
+                subscriber.put_nowait(message)
+            except queue.Full:
+                # Subscriber terlalu lambat: putuskan supaya tidak menahan memori.
+                # Client akan reconnect dan menerima sisa event dari replay buffer.
+                self.unsubscribe(subscriber)
+                with subscriber.mutex:
+                    subscriber.queue.clear()
+                subscriber.put_nowait(None)
+
+    def subscribe(self, last_event_id=None):
+        """Daftarkan subscriber baru beserta event yang terlewat sejak last_event_id"""
+        subscriber = queue.Queue(maxsize=self.subscriber_queue_size)
+        with self._lock:
+            missed = [m for m in self.replay if last_event_id is not None and m[0] > last_event_id]
+            self._subscribers.add(subscriber)
+        return subscriber, missed
+
+    def unsubscribe(self, subscriber):
+        with self._lock:
+            self._subscribers.discard(subscriber)
+
+    def subscriber_count(self):
+        with self._lock:
+            return len(self._subscribers)
+
+    @staticmethod
+    def format_sse(message):
+        """Format satu event sesuai protokol text/event-stream"""
+        event_id, event, data = message
+        return f"id: {event_id}\nevent: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+
+    def stream(self, last_event_id=None, keepalive=15):
+        """Generator SSE: replay event yang terlewat lalu kirim event baru saat tersedia"""
+        subscriber, missed = self.subscribe(last_event_id)
+        try:
+            for message in missed:
+                yield self.format_sse(message)
+            while True:
+                try:
+                    message = subscriber.get(timeout=keepalive)
+                except queue.Empty:
+                    # Komentar keepalive agar koneksi tidak diputus proxy
+                    yield ": keepalive\n\n"
+                    continue
+                if message is None:
+                    break
+                yield self.format_sse(message)
+        finally:
+            self.unsubscribe(subscriber)
@@ -0,0 +1,72 @@
+import threading
+
+import cv2
+import numpy as np
+
+HASH_SIZE = 8  # dHash 8x8 = 64 bit
+
+
+def dhash(gray, hash_size=HASH_SIZE):
+    """Difference hash dari gambar grayscale: bandingkan piksel bertetangga
+    pada versi kecil (hash_size+1 x hash_size). Return int 64 bit."""
+    small = cv2.resize(gray, (hash_size + 1, hash_size), interpolation=cv2.INTER_AREA)
+    bits = small[:, 1:] > small[:, :-1]
+    return int.from_bytes(np.packbits(bits).tobytes(), 'big')
+
+
+def hamming(a, b):
+    """Jumlah bit yang berbeda antara dua hash"""
+    return bin(a ^ b).count('1')
+
+
+class DuplicateDetector:
+    """Deteksi frame yang hampir sama dengan frame tersimpan terakhir per perangkat.
+
+    Pembanding selalu frame terakhir yang benar-benar disimpan (bukan duplikat),
+    sehingga perubahan kecil yang menumpuk perlahan tetap terdeteksi.
+    """
+
+    def __init__(self, threshold=5):
+        self.threshold = threshold
+        self.checked = 0
+        self.duplicates = 0
+        self.bytes_saved = 0
+        self._last = {}  # device -> (hash, filename)
+        self._lock = threading.Lock()
+
+    def check(self, device, frame_hash):
+        """Return nama frame pembanding jika frame ini duplikat, atau None"""
+        with self._lock:
+            self.checked += 1
+            last = self._last.get(device)
+            if last and hamming(last[0], frame_hash) <= self.threshold:
+                return last[1]
+            return None
+
+    def record_stored(self, device, frame_hash, filename):
+        """Jadikan frame yang baru disimpan sebagai pembanding berikutnya"""
+        with self._lock:
+            self._last[device] = (frame_hash, filename)
+
+    def record_duplicate(self, size):
+        with self._lock:
+            self.duplicates += 1
+            self.bytes_saved += size
+
+    def forget(self, match):
+        """Lupakan pembanding yang gambarnya sudah dihapus (match(filename) bernilai True)"""
+        with self._lock:
+            for device, (_, name) in list(self._last.items()):
+                if match(name):
+                    del self._last[device]
+
+    def stats(self):
+        """Ringkasan counter deteksi duplikat"""
+        with self._lock:
+            return {
+                "threshold": self.threshold,
+                "checked": self.checked,
+                "duplicates": self.duplicates,
+                "bytes_saved": self.bytes_saved,
+                "devices": len(self._last)
+            }
@@ -0,0 +1,154 @@
+import os
+import shutil
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import cv2
+import numpy as np
+
+from frame_layout import prune_empty_dirs
+from jpeg_utils import parse_jpeg_header
+
+# Nama ukuran turunan -> lebar maksimal (piksel)
+DEFAULT_SIZES = {"thumb": 160, "preview": 640}
+
+
+class DerivativeWorker:
+    """Membuat gambar turunan (thumbnail, preview) di thread pool latar belakang.
+
+    Setiap frame di-decode sekali dengan skala JPEG terkecil yang masih cukup
+    untuk ukuran terbesar, lalu di-resize dan di-encode ke setiap ukuran.
+    OpenCV melepas GIL saat decode/resize/encode, jadi thread tidak
+    menahan request lain.
+    """
+
+    def __init__(self, folder, sizes=None, workers=2, quality=80, logger=None):
+        self.folder = folder
+        self.sizes = dict(sizes or DEFAULT_SIZES)
+        self.quality = quality
+        self.logger = logger
+        self.generated = 0
+        self.failed = 0
+        self._pending = set()
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="derivatives")
+        os.makedirs(folder, exist_ok=True)
+
+    def path(self, name, size):
+        """Path file turunan. Frame layout files (YYYY/MM/DD/HH/...) memakai folder yang sama,
+        frame segment store (segXXXXXX-YYYYYYYY) dikelompokkan per segment."""
+        if '/' in name:
+            parts = name.split('/')
+        else:
+            parts = [name.split('-')[0], name]
+        parts[-1] = os.path.splitext(parts[-1])[0] + '.jpg'
+        return os.path.join(self.folder, size, *parts)
+
+    def submit(self, name, source, callback=None):
+        """Jadwalkan pembuatan turunan. `source` berupa path file JPEG
+        atau fungsi tanpa argumen yang mengembalikan byte JPEG. `callback`
+        dipanggil dengan {ukuran: byte JPEG} setelah semua turunan dibuat."""
+        with self._lock:
+            if name in self._pending:
+                return
+            self._pending.add(name)
+        self._executor.submit(self._run, name, source, callback)
+
+    def ensure(self, name, size, source):
+        """Path turunan `size`; dibuat langsung jika worker belum selesai"""
+        path = self.path(name, size)
+        if not os.path.exists(path):
+            self.generate(name, source)
+        return path
+
+    def generate(self, name, source):
+        """Buat semua ukuran turunan untuk satu frame. Return {ukuran: byte JPEG}"""
+        if callable(source):
+            data = source()
+        else:
+            with open(source, 'rb') as f:
+                data = f.read()
+        img = self._decode(data)
+        height, width = img.shape[:2]
+        outputs = {}
+        for size, max_width in self.sizes.items():
+            if width > max_width:
+                resized = cv2.resize(img, (max_width, max(1, round(height * max_width / width))),
+                                     interpolation=cv2.INTER_AREA)
+            else:
+                resized = img
+            ok, encoded = cv2.imencode('.jpg', resized, [cv2.IMWRITE_JPEG_QUALITY, self.quality])
+            if not ok:
+                raise ValueError(f"Gagal encode turunan {size}")
+            path = self.path(name, size)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            temp_path = f"{path}.{threading.get_ident()}.tmp"
+            with open(temp_path, 'wb') as f:
+                f.write(encoded)
+            os.replace(temp_path, path)
+            outputs[size] = encoded.tobytes()
+        return outputs
+
+    def remove(self, name):
+        """Hapus semua turunan satu frame"""
+        for size in self.sizes:
+            path = self.path(name, size)
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                continue
+            prune_empty_dirs(os.path.dirname(path), os.path.join(self.folder, size))
+
+    def remove_group(self, group):
+        """Hapus folder turunan satu kelompok (mis. satu segment atau satu shard)"""
+        for size in self.sizes:
+            shutil.rmtree(os.path.join(self.folder, size, *group.split('/')), ignore_errors=True)
+
+    def clear(self):
+        for size in self.sizes:
+            shutil.rmtree(os.path.join(self.folder, size), ignore_errors=True)
+
+    def stop(self):
+        self._executor.shutdown(wait=False)
+
+    def stats(self):
+        with self._lock:
+            return {
+                "pending": len(self._pending),
+                "generated": self.generated,
+                "failed": self.failed
+            }
+
+    def _decode(self, data):
+        # Pilih skala decode JPEG (1/8, 1/4, 1/2) yang masih >= ukuran terbesar
+        flags = cv2.IMREAD_COLOR
+        try:
+            width, _ = parse_jpeg_header(data)
+        except ValueError:
+            width = 0
+        largest = max(self.sizes.values())
+        for factor, reduced in ((8, cv2.IMREAD_REDUCED_COLOR_8), (4, cv2.IMREAD_REDUCED_COLOR_4),
+                                (2, cv2.IMREAD_REDUCED_COLOR_2)):
+            if width and width // factor >= largest:
+                flags = reduced
+                break
+        img = cv2.imdecode(np.frombuffer(data, np.uint8), flags)
+        if img is None:
+            raise ValueError("Data gambar tidak valid")
+        return img
+
+    def _run(self, name, source, callback):
+        try:
+            outputs = self.generate(name, source)
+            with self._lock:
+                self.generated += 1
+            if callback:
+                callback(outputs)
+        except Exception as e:
+            with self._lock:
+                self.failed += 1
+            if self.logger:
+                self.logger.error(f"Gagal membuat turunan {name}: {str(e)}")
+        finally:
+            with self._lock:
+                self._pending.discard(name)
@@ -0,0 +1,254 @@
+import bisect
+import json
+import os
+import threading
+
+try:
+    import fcntl
+except ImportError:  # Windows: hanya mode satu proses
+    fcntl = None
+
+ENTRY_KEYS = ("filename", "size", "created", "duplicate_of", "quality")
+
+
+class FrameIndex:
+    """Index gambar yang tersimpan, urut berdasarkan waktu simpan.
+
+    Gambar terbaru selalu tersedia di memori (O(1)) dan pencarian
+    `since` memakai bisect (O(log n)), jadi endpoint tidak perlu
+    listdir folder upload. Jika manifest_path diisi, setiap perubahan
+    dicatat ke file JSON Lines agar index bisa dimuat ulang tanpa scan folder.
+
+    Jika beberapa proses worker memakai manifest yang sama, setiap proses
+    memanggil refresh() untuk membaca perubahan dari proses lain. Penulisan
+    manifest memakai file lock sehingga baris tidak saling tumpang tindih.
+    """
+
+    def __init__(self, manifest_path=None):
+        self.manifest_path = manifest_path
+        self._keys = []      # (created, name), selalu terurut
+        self._entries = {}   # name -> {"filename", "size", "created"[, "duplicate_of", "quality"]}
+        self._refs = {}      # name -> nama entri duplikat yang merujuk ke gambar ini
+        self._manifest_ops = 0
+        self._offset = 0     # Posisi manifest yang sudah dibaca (untuk refresh)
+        self._inode = None   # Berubah jika manifest ditulis ulang (kompaksi)
+        self._lock = threading.RLock()
+
+    def build(self, folder, prefix='', suffix='.jpg'):
+        """Isi index dengan scan folder (dipakai jika manifest belum ada)"""
+        entries = []
+        for root, _, filenames in os.walk(folder):
+            for filename in filenames:
+                if not (filename.startswith(prefix) and filename.endswith(suffix)):
+                    continue
+                path = os.path.join(root, filename)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                name = os.path.relpath(path, folder).replace(os.sep, '/')
+                entries.append({"filename": name, "size": stat.st_size, "created": stat.st_mtime})
+        with self._lock:
+            self._reset(entries)
+            self._rewrite_manifest(merge=False)
+
+    def load(self):
+        """Muat index dari manifest. Return False jika manifest tidak tersedia"""
+        if not self.manifest_path or not os.path.exists(self.manifest_path):
+            return False
+        with open(self.manifest_path, 'rb') as f:
+            inode = os.fstat(f.fileno()).st_ino
+            records, consumed = _parse_records(f.read())
+        entries = {}
+        for record in records:
+            if record.get("op") == "add":
+                entries[record["filename"]] = {key: record[key] for key in ENTRY_KEYS if key in record}
+            elif record.get("op") == "remove":
+                entries.pop(record["filename"], None)
+            elif record.get("op") == "clear":
+                entries.clear()
+        with self._lock:
+            self._reset(entries.values())
+            self._manifest_ops = len(records)
+            self._offset = consumed
+            self._inode = inode
+        return True
+
+    def refresh(self):
+        """Terapkan perubahan yang ditulis proses lain sejak manifest terakhir dibaca.
+        Return daftar record baru, atau None jika manifest sudah ditulis ulang
+        sehingga index dimuat ulang penuh."""
+        if not self.manifest_path:
+            return []
+        with self._lock:
+            try:
+                stat = os.stat(self.manifest_path)
+            except FileNotFoundError:
+                return []
+            if stat.st_ino != self._inode or stat.st_size < self._offset:
+                self.load()
+                return None
+            if stat.st_size == self._offset:
+                return []
+            with open(self.manifest_path, 'rb') as f:
+                f.seek(self._offset)
+                records, consumed = _parse_records(f.read())
+            # Record milik proses ini ikut terbaca lagi; menerapkannya ulang tidak mengubah hasil
+            for record in records:
+                self._apply(record)
+            self._offset += consumed
+            self._manifest_ops += len(records)
+            return records
+
+    def add(self, name, size, created, duplicate_of=None, quality=None):
+        """Tambah entri gambar. Entri dengan duplicate_of tidak punya file sendiri,
+        isinya sama dengan gambar yang dirujuk. `quality` berisi tag masalah kualitas."""
+        entry = {"filename": name, "size": size, "created": created}
+        if duplicate_of:
+            entry["duplicate_of"] = duplicate_of
+        if quality:
+            entry["quality"] = list(quality)
+        with self._lock:
+            self._apply({"op": "add", **entry})
+            self._append_manifest({"op": "add", **entry})
+        return dict(entry)
+
+    def remove(self, name):
+        """Hapus entri beserta entri duplikat yang merujuk ke gambar tersebut"""
+        with self._lock:
+            for ref in sorted(self._refs.pop(name, ())):
+                if self._remove(ref):
+                    self._append_manifest({"op": "remove", "filename": ref})
+            if self._remove(name):
+                self._append_manifest({"op": "remove", "filename": name})
+
+    def clear(self):
+        with self._lock:
+            self._reset([])
+            self._append_manifest({"op": "clear"})
+
+    def get(self, name):
+        """Entri gambar berdasarkan nama atau None"""
+        with self._lock:
+            entry = self._entries.get(name)
+            return dict(entry) if entry else None
+
+    def latest(self):
+        """Entri gambar terbaru atau None"""
+        with self._lock:
+            if not self._keys:
+                return None
+            return dict(self._entries[self._keys[-1][1]])
+
+    def since(self, created, limit=100, after=None):
+        """Entri yang disimpan setelah waktu `created` (epoch detik), urut naik.
+        Jika `after` (nama entri) diisi, mulai tepat setelah entri (created, after),
+        sehingga entri lain dengan `created` yang sama tidak terlewat."""
+        with self._lock:
+            start = bisect.bisect_right(self._keys, (created, '\uffff' if after is None else after))
+            return [dict(self._entries[name]) for _, name in self._keys[start:start + limit]]
+
+    def __len__(self):
+        return len(self._keys)
+
+    def _apply(self, record):
+        """Terapkan satu record manifest ke index di memori"""
+        op = record.get("op")
+        if op == "add":
+            entry = {key: record[key] for key in ENTRY_KEYS if key in record}
+            name = entry["filename"]
+            self._remove(name)
+            self._entries[name] = entry
+            bisect.insort(self._keys, (entry["created"], name))
+            if entry.get("duplicate_of"):
+                self._refs.setdefault(entry["duplicate_of"], set()).add(name)
+        elif op == "remove":
+            self._remove(record["filename"])
+        elif op == "clear":
+            self._reset([])
+
+    def _reset(self, entries):
+        self._entries = {entry["filename"]: entry for entry in entries}
+        self._keys = sorted((entry["created"], name) for name, entry in self._entries.items())
+        self._refs = {}
+        for name, entry in self._entries.items():
+            if entry.get("duplicate_of"):
+                self._refs.setdefault(entry["duplicate_of"], set()).add(name)
+
+    def _remove(self, name):
+        entry = self._entries.pop(name, None)
+        if entry is None:
+            return False
+        if entry.get("duplicate_of") in self._refs:
+            self._refs[entry["duplicate_of"]].discard(name)
+        key = (entry["created"], name)
+        index = bisect.bisect_left(self._keys, key)
+        if index < len(self._keys) and self._keys[index] == key:
+            del self._keys[index]
+        return True
+
+    def _append_manifest(self, record):
+        if not self.manifest_path:
+            return
+        line = (json.dumps(record) + "\n").encode()
+        with _locked_manifest(self.manifest_path) as f:
+            f.write(line)
+        self._manifest_ops += 1
+        # Tulis ulang manifest jika log sudah jauh lebih panjang dari isi index
+        if self._manifest_ops > 2 * len(self._entries) + 1000:
+            self._rewrite_manifest()
+
+    def _rewrite_manifest(self, merge=True):
+        if not self.manifest_path:
+            return
+        with _locked_manifest(self.manifest_path):
+            if merge:
+                # Ambil dulu perubahan dari proses lain agar tidak hilang saat ditulis ulang
+                self.refresh()
+            temp_path = f"{self.manifest_path}.{os.getpid()}.tmp"
+            with open(temp_path, 'wb') as f:
+                for _, name in self._keys:
+                    f.write((json.dumps({"op": "add", **self._entries[name]}) + "\n").encode())
+                size = f.tell()
+            os.replace(temp_path, self.manifest_path)
+            self._manifest_ops = len(self._keys)
+            self._offset = size
+            self._inode = os.stat(self.manifest_path).st_ino
+
+
+class _locked_manifest:
+    """Buka manifest untuk append dengan lock eksklusif. Jika manifest ditulis ulang
+    proses lain saat menunggu lock, file baru dibuka ulang."""
+
+    def __init__(self, path):
+        self.path = path
+        self.file = None
+
+    def __enter__(self):
+        while True:
+            self.file = open(self.path, 'ab')
+            if fcntl is None:
+                return self.file
+            fcntl.flock(self.file.fileno(), fcntl.LOCK_EX)
+            try:
+                if os.fstat(self.file.fileno()).st_ino == os.stat(self.path).st_ino:
+                    return self.file
+            except FileNotFoundError:
+                pass
+            self.file.close()
+
+    def __exit__(self, *exc):
+        self.file.close()  # Lock dilepas saat file ditutup
+
+
+def _parse_records(data):
+    """Record JSON dari byte manifest. Baris terakhir yang belum lengkap (masih ditulis
+    proses lain, atau terpotong saat proses berhenti) tidak dihitung. Return (records, byte terpakai)."""
+    end = data.rfind(b"\n") + 1
+    records = []
+    for line in data[:end].splitlines():
+        try:
+            records.append(json.loads(line))
+        except ValueError:
+            continue
+    return records, end
@@ -0,0 +1,56 @@
+import itertools
+import os
+import re
+from datetime import datetime
+
+DEFAULT_DEVICE = "esp32cam"
+TIMESTAMP_FORMAT = '%Y%m%d_%H%M%S_%f'  # Waktu di nama frame dan field timestamp API
+_sequence = itertools.count(1)
+_LEGACY_NAME = re.compile(r'^esp32cam_(\d{8}_\d{6})\.jpg$')
+
+
+def sanitize_device(device):
+    """Nama perangkat aman untuk nama file (huruf, angka dan '-')"""
+    cleaned = re.sub(r'[^A-Za-z0-9-]', '', device or '')[:32]
+    return cleaned or DEFAULT_DEVICE
+
+
+def shard_dir(timestamp):
+    """Folder YYYY/MM/DD/HH untuk timestamp"""
+    return timestamp.strftime('%Y/%m/%d/%H')
+
+
+def build_frame_name(device=None, timestamp=None, sequence=None):
+    """Path relatif unik untuk frame baru: YYYY/MM/DD/HH/<device>_<waktu mikrodetik>_<urutan>.jpg"""
+    timestamp = timestamp or datetime.now()
+    sequence = next(_sequence) if sequence is None else sequence
+    filename = f"{sanitize_device(device)}_{timestamp.strftime(TIMESTAMP_FORMAT)}_{sequence % 10000:04d}.jpg"
+    return f"{shard_dir(timestamp)}/{filename}"
+
+
+def frame_timestamp(name):
+    """Waktu pengambilan dari nama frame, dipakai di response API: YYYYmmdd_HHMMSS_ffffff
+    untuk nama baru, YYYYmmdd_HHMMSS untuk layout lama, '' jika tidak ada"""
+    # Baru: <device>_YYYYmmdd_HHMMSS_ffffff_<urutan>, lama: esp32cam_YYYYmmdd_HHMMSS
+    parts = os.path.splitext(os.path.basename(name))[0].split('_')
+    return '_'.join(parts[1:4])
+
+
+def legacy_frame_timestamp(filename):
+    """Waktu dari nama file layout lama (esp32cam_YYYYmmdd_HHMMSS.jpg) atau None"""
+    match = _LEGACY_NAME.match(filename)
+    if not match:
+        return None
+    return datetime.strptime(match.group(1), '%Y%m%d_%H%M%S')
+
+
+def prune_empty_dirs(path, root):
+    """Hapus folder shard yang kosong dari `path` ke atas, berhenti di `root`"""
+    root = os.path.abspath(root)
+    current = os.path.abspath(path)
+    while current.startswith(root + os.sep):
+        try:
+            os.rmdir(current)
+        except OSError:
+            break  # Folder tidak kosong
+        current = os.path.dirname(current)
@@ -0,0 +1,64 @@
+import cv2
+
+PREVIEW_WIDTH = 320  # Lebar salinan grayscale untuk pemeriksaan murah (hash, kualitas)
+
+# Masalah kualitas dan bit-nya (disimpan sebagai flags di segment store)
+QUALITY_ISSUES = ('dark', 'overexposed', 'blurry')
+
+DEFAULT_THRESHOLDS = {
+    "min_brightness": 40,    # Rata-rata intensitas minimal (0-255)
+    "max_brightness": 215,   # Rata-rata intensitas maksimal
+    "max_clipped": 0.25,     # Porsi piksel maksimal yang hitam (<=5) atau putih (>=250)
+    "min_sharpness": 60.0    # Variance Laplacian minimal pada lebar PREVIEW_WIDTH
+}
+
+
+def load_preview_gray(path, img=None, width=PREVIEW_WIDTH):
+    """Salinan grayscale kecil dari gambar. Jika gambar sudah di-decode, pakai itu;
+    jika belum (mode passthrough), decode JPEG dengan skala yang lebih murah."""
+    if img is None:
+        # Skala 1/4 dari decoder JPEG: UXGA 1600x1200 menjadi 400x300
+        gray = cv2.imread(path, cv2.IMREAD_REDUCED_GRAYSCALE_4)
+        if gray is None:
+            raise ValueError("Data gambar tidak valid")
+    else:
+        gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
+    if gray.shape[1] > width:
+        height = max(1, round(gray.shape[0] * width / gray.shape[1]))
+        gray = cv2.resize(gray, (width, height), interpolation=cv2.INTER_AREA)
+    return gray
+
+
+def measure_quality(gray):
+    """Ukur ketajaman (variance Laplacian), kecerahan rata-rata dan porsi piksel terpotong"""
+    total = gray.size
+    return {
+        "sharpness": float(cv2.Laplacian(gray, cv2.CV_64F).var()),
+        "brightness": float(gray.mean()),
+        "dark_clipped": float((gray <= 5).sum()) / total,
+        "bright_clipped": float((gray >= 250).sum()) / total
+    }
+
+
+def assess_quality(metrics, thresholds=None):
+    """Daftar masalah kualitas (subset QUALITY_ISSUES), kosong jika gambar layak"""
+    thresholds = {**DEFAULT_THRESHOLDS, **(thresholds or {})}
+    issues = []
+    if metrics["brightness"] < thresholds["min_brightness"] or metrics["dark_clipped"] > thresholds["max_clipped"]:
+        issues.append('dark')
+    if metrics["brightness"] > thresholds["max_brightness"] or metrics["bright_clipped"] > thresholds["max_clipped"]:
+        issues.append('overexposed')
+    # Gambar gelap/terang berlebih juga tampak "blur"; hanya laporkan blur jika eksposurnya normal
+    if not issues and metrics["sharpness"] < thresholds["min_sharpness"]:
+        issues.append('blurry')
+    return issues
+
+
+def encode_issues(issues):
+    """Ubah daftar masalah kualitas menjadi bitmask"""
+    return sum(1 << QUALITY_ISSUES.index(issue) for issue in issues)
+
+
+def decode_issues(flags):
+    """Kebalikan encode_issues"""
+    return [issue for bit, issue in enumerate(QUALITY_ISSUES) if flags & (1 << bit)]
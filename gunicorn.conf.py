@@ -0,0 +1,23 @@
+"""Konfigurasi gunicorn untuk wsgi.py.
+
+Jumlah worker diatur lewat EDUNUDGE_WORKERS (default: jumlah CPU). Worker
+'gthread' dipakai karena /api/stream (SSE) dan /api/camera/live (MJPEG)
+menahan satu thread per client selama koneksi terbuka.
+"""
+import multiprocessing
+import os
+
+bind = os.environ.get("EDUNUDGE_BIND", "0.0.0.0:5001")
+workers = int(os.environ.get("EDUNUDGE_WORKERS", multiprocessing.cpu_count()))
+worker_class = "gthread"
+threads = int(os.environ.get("EDUNUDGE_THREADS", 8))
+timeout = 60
+# App dimuat di setiap worker (bukan di master) agar MongoClient tidak terbawa fork
+preload_app = False
+
+
+def on_starting(server):
+    """Tugas startup sekali per deployment: index database, bersihkan upload, backup"""
+    from flask_app import run_startup_tasks
+    # Mode multi-worker: log ke stderr (worker mewarisi handler dari master)
+    run_startup_tasks({"MULTI_PROCESS": True})
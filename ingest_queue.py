@@ -0,0 +1,136 @@
+import queue
+import threading
+import time
+import logging
+
+
+class WriteBehindQueue:
+    """Antrian write-behind: data disimpan di memori lalu ditulis ke database secara berkelompok.
+
+    Handler cukup memanggil put() lalu langsung merespons, sementara thread
+    latar belakang menulis batch saat jumlahnya mencapai batch_size atau
+    saat data tertua sudah menunggu lebih dari max_age detik.
+    """
+
+    def __init__(self, flush_func, max_size=10000, batch_size=200, max_age=1.0,
+                 retry_delay=2.0, logger=None):
+        self.flush_func = flush_func
+        self.batch_size = batch_size
+        self.max_age = max_age
+        self.retry_delay = retry_delay
+        self.logger = logger or logging.getLogger(__name__)
+
+        self._queue = queue.Queue(maxsize=max_size)
+        self._stop_event = threading.Event()
+        self._thread = None
+        self._lock = threading.Lock()
+
+        # Counter untuk monitoring
+        self.enqueued = 0
+        self.dropped = 0
+        self.flushed = 0
+        self.batches = 0
+        self.failed_flushes = 0
+
+    def start(self):
+        """Jalankan thread flusher (aman dipanggil berulang kali)"""
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name="write-behind-flusher", daemon=True)
+        self._thread.start()
+
+    def put(self, document):
+        """Masukkan dokumen ke antrian. Return False jika antrian penuh (data dibuang)"""
+        try:
+            self._queue.put_nowait(document)
+        except queue.Full:
+            with self._lock:
+                self.dropped += 1
+            return False
+        with self._lock:
+            self.enqueued += 1
+        return True
+
+    def stop(self, timeout=10):
+        """Hentikan flusher dan tulis semua data yang tersisa"""
+        self._stop_event.set()
+        if self._thread:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def stats(self):
+        """Ringkasan counter antrian"""
+        with self._lock:
+            return {
+                "queue_depth": self._queue.qsize(),
+                "queue_capacity": self._queue.maxsize,
+                "enqueued": self.enqueued,
+                "flushed": self.flushed,
+                "dropped": self.dropped,
+                "batches": self.batches,
+                "failed_flushes": self.failed_flushes,
+                "running": bool(self._thread and self._thread.is_alive())
+            }
+
+    def _collect_batch(self):
+        """Ambil satu batch: tunggu data pertama, lalu kumpulkan sampai penuh atau kedaluwarsa"""
+        batch = []
+        try:
+            batch.append(self._queue.get(timeout=0.5))
+        except queue.Empty:
+            return batch
+
+        deadline = time.monotonic() + self.max_age
+        while len(batch) < self.batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0 or self._stop_event.is_set():
+                break
+            try:
+                batch.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    def _drain(self):
+        """Ambil semua data yang tersisa tanpa menunggu"""
+        batch = []
+        while True:
+            try:
+                batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                return batch
+
+    def _flush(self, batch):
+        """Tulis batch ke database. Return False jika gagal supaya bisa dicoba ulang"""
+        try:
+            self.flush_func(batch)
+        except Exception as e:
+            with self._lock:
+                self.failed_flushes += 1
+            self.logger.error(f"Write-behind flush gagal ({len(batch)} data): {str(e)}")
+            return False
+        with self._lock:
+            self.flushed += len(batch)
+            self.batches += 1
+        return True
+
+    def _run(self):
+        pending = []
+        while not self._stop_event.is_set():
+            if not pending:
+                pending = self._collect_batch()
+            if pending and not self._flush(pending):
+                # Database bermasalah: tahan batch dan coba lagi nanti
+                self._stop_event.wait(self.retry_delay)
+                continue
+            pending = []
+
+        # Shutdown: tulis batch tertunda dan sisa antrian
+        remaining = pending + self._drain()
+        for start in range(0, len(remaining), self.batch_size):
+            if not self._flush(remaining[start:start + self.batch_size]):
+                with self._lock:
+                    self.dropped += len(remaining) - start
+                self.logger.error(f"Write-behind: {len(remaining) - start} data hilang saat shutdown")
+                break
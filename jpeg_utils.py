@@ -0,0 +1,59 @@
+import struct
+
+# Marker Start Of Frame yang menyimpan dimensi gambar (SOF0-SOF15 kecuali DHT/JPG/DAC)
+SOF_MARKERS = {0xC0, 0xC1, 0xC2, 0xC3, 0xC5, 0xC6, 0xC7, 0xC9, 0xCA, 0xCB, 0xCD, 0xCE, 0xCF}
+HEADER_READ_SIZE = 65536  # Header (termasuk EXIF) ESP32-CAM jauh lebih kecil dari ini
+TAIL_READ_SIZE = 64
+
+
+def parse_jpeg_header(data):
+    """Validasi JPEG tanpa decode: cek marker SOI/EOI dan baca dimensi dari header SOF.
+    Return (width, height). Raise ValueError jika data bukan JPEG yang utuh."""
+    _check_eoi(data[-TAIL_READ_SIZE:])
+    return _read_dimensions(data)
+
+
+def parse_jpeg_file(path):
+    """Sama seperti parse_jpeg_header, tetapi hanya membaca awal dan akhir file"""
+    with open(path, 'rb') as f:
+        head = f.read(HEADER_READ_SIZE)
+        f.seek(0, 2)
+        f.seek(max(0, f.tell() - TAIL_READ_SIZE))
+        tail = f.read()
+    _check_eoi(tail)
+    return _read_dimensions(head)
+
+
+def _check_eoi(tail):
+    # Beberapa encoder menambahkan padding setelah EOI
+    if not tail.rstrip(b'\x00').endswith(b'\xff\xd9'):
+        raise ValueError("Data gambar tidak lengkap (marker EOI tidak ditemukan)")
+
+
+def _read_dimensions(data):
+    if len(data) < 4 or data[0:2] != b'\xff\xd8':
+        raise ValueError("Data gambar tidak valid (marker SOI tidak ditemukan)")
+
+    offset = 2
+    while offset + 4 <= len(data):
+        if data[offset] != 0xFF:
+            raise ValueError("Header JPEG rusak")
+        marker = data[offset + 1]
+        if marker == 0xFF:  # Padding antar marker
+            offset += 1
+            continue
+        if marker in (0xD8, 0x01) or 0xD0 <= marker <= 0xD7:  # Marker tanpa panjang
+            offset += 2
+            continue
+        if marker in (0xD9, 0xDA):  # EOI/SOS sebelum SOF berarti header tidak lengkap
+            break
+        (length,) = struct.unpack('>H', data[offset + 2:offset + 4])
+        if marker in SOF_MARKERS:
+            if offset + 9 > len(data):
+                break
+            height, width = struct.unpack('>HH', data[offset + 5:offset + 9])
+            if width == 0 or height == 0:
+                raise ValueError("Dimensi JPEG tidak valid")
+            return width, height
+        offset += 2 + length
+    raise ValueError("Header JPEG tidak berisi dimensi gambar")
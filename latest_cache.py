@@ -0,0 +1,70 @@
+import heapq
+import threading
+from collections import deque
+
+
+class LatestReadingsCache:
+    """Ring buffer data sensor terbaru per perangkat, disimpan di memori.
+
+    Response /api/sensor/latest di-render sekali lalu dipakai ulang sampai
+    ada data baru yang ditulis, sehingga endpoint tidak perlu query MongoDB.
+    """
+
+    def __init__(self, per_device=10, default_device="ESP32-Sensor"):
+        self.per_device = per_device
+        self.default_device = default_device
+        self.warmed = False
+        self.version = 0
+        self._buffers = {}
+        self._rendered = {}
+        self._lock = threading.Lock()
+
+    def _append(self, document):
+        # Field device berasal dari payload perangkat, bisa berupa list/dict (tidak hashable)
+        device = document.get('device', self.default_device)
+        if not isinstance(device, str):
+            device = str(device)
+        buffer = self._buffers.setdefault(device, deque(maxlen=self.per_device))
+        buffer.append(document)
+
+    def add(self, documents):
+        """Tambahkan data yang sudah diformat (timestamp berupa string ISO)"""
+        with self._lock:
+            for document in documents:
+                self._append(document)
+            self.version += 1
+            self._rendered.clear()
+
+    def fill(self, documents):
+        """Isi awal dari database (cold start). Dokumen boleh dalam urutan apa saja.
+        Data yang masuk lewat add() selama query database berjalan tetap disimpan."""
+        with self._lock:
+            merged = {document['_id']: document for document in documents}
+            for buffer in self._buffers.values():
+                merged.update((document['_id'], document) for document in buffer)
+            self._buffers.clear()
+            for document in sorted(merged.values(), key=lambda doc: doc['timestamp']):
+                self._append(document)
+            self.warmed = True
+            self.version += 1
+            self._rendered.clear()
+
+    def latest(self, limit=10):
+        """Data terbaru dari semua perangkat, urut dari yang paling baru"""
+        with self._lock:
+            merged = heapq.merge(*(reversed(buffer) for buffer in self._buffers.values()),
+                                 key=lambda doc: doc['timestamp'], reverse=True)
+            return [document for _, document in zip(range(limit), merged)]
+
+    def render(self, limit, builder):
+        """Kembalikan hasil builder(latest(limit)) yang di-cache sampai ada write berikutnya"""
+        with self._lock:
+            cached = self._rendered.get(limit)
+            version = self.version
+        if cached is not None:
+            return cached
+        rendered = builder(self.latest(limit))
+        with self._lock:
+            if self.version == version:
+                self._rendered[limit] = rendered
+        return rendered
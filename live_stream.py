@@ -0,0 +1,59 @@
+import threading
+
+
+class LiveFrameBuffer:
+    """Buffer fan-out untuk stream MJPEG: hanya menyimpan satu frame terbaru.
+
+    Upload baru menggantikan frame dan membangunkan semua viewer. Setiap viewer
+    membaca frame yang sama dari memori (tanpa baca disk atau polling API);
+    viewer yang lambat cukup melewatkan frame lama, tidak ada antrian per viewer.
+    """
+
+    def __init__(self, boundary='frame'):
+        self.boundary = boundary
+        self.subscribers = 0
+        self._frame = None
+        self._created = float('-inf')
+        self._sequence = 0
+        self._condition = threading.Condition()
+
+    def publish(self, data, created):
+        """Ganti frame terbaru. Frame yang lebih lama dari frame saat ini diabaikan
+        (worker turunan bisa selesai tidak berurutan). Return True jika dipakai."""
+        with self._condition:
+            if created < self._created:
+                return False
+            self._frame = data
+            self._created = created
+            self._sequence += 1
+            self._condition.notify_all()
+        return True
+
+    def format_part(self, data):
+        """Satu bagian multipart/x-mixed-replace"""
+        header = (
+            f"--{self.boundary}\r\n"
+            f"Content-Type: image/jpeg\r\n"
+            f"Content-Length: {len(data)}\r\n\r\n"
+        ).encode()
+        return header + data + b"\r\n"
+
+    def stream(self, keepalive=15):
+        """Generator multipart untuk satu viewer. Frame terakhir dikirim ulang
+        setiap `keepalive` detik agar koneksi tidak diputus proxy. Sebelum ada frame
+        dikirim CRLF (preamble multipart, diabaikan browser) sehingga viewer yang
+        sudah putus terdeteksi sebagai error tulis dan slot worker-nya dilepas."""
+        with self._condition:
+            self.subscribers += 1
+            sequence, frame = self._sequence, self._frame
+        try:
+            # Kirim langsung agar header response terkirim meskipun belum ada frame
+            yield self.format_part(frame) if frame is not None else b"\r\n"
+            while True:
+                with self._condition:
+                    self._condition.wait_for(lambda: self._sequence != sequence, timeout=keepalive)
+                    sequence, frame = self._sequence, self._frame
+                yield self.format_part(frame) if frame is not None else b"\r\n"
+        finally:
+            with self._condition:
+                self.subscribers -= 1
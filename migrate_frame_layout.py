@@ -0,0 +1,48 @@
+"""Migrasi gambar dari folder upload datar (esp32cam_YYYYmmdd_HHMMSS.jpg)
+ke layout YYYY/MM/DD/HH dengan nama unik.
+
+Hentikan server Flask sebelum menjalankan migrasi, lalu jalankan:
+    python migrate_frame_layout.py
+    python migrate_frame_layout.py --dry-run
+
+Setelah file dipindahkan, index gambar (frame manifest) dibangun ulang.
+"""
+import argparse
+import os
+
+from frame_index import FrameIndex
+from frame_layout import DEFAULT_DEVICE, build_frame_name, legacy_frame_timestamp
+
+
+def migrate(folder, dry_run=False):
+    """Pindahkan file layout lama ke folder shard. Return jumlah file yang dipindahkan"""
+    moved = 0
+    for filename in sorted(os.listdir(folder)):
+        source = os.path.join(folder, filename)
+        timestamp = legacy_frame_timestamp(filename)
+        if timestamp is None or not os.path.isfile(source):
+            continue
+        # Layout lama hanya punya presisi detik, jadi urutan tetap 0
+        destination = os.path.join(folder, build_frame_name(DEFAULT_DEVICE, timestamp, sequence=0))
+        print(f"{filename} -> {os.path.relpath(destination, folder)}")
+        if not dry_run:
+            os.makedirs(os.path.dirname(destination), exist_ok=True)
+            os.replace(source, destination)  # mtime tetap sama
+        moved += 1
+    return moved
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Migrasi gambar ke layout YYYY/MM/DD/HH")
+    parser.add_argument('--folder', default='static/uploads', help="Folder upload gambar")
+    parser.add_argument('--manifest', default='static/frame_manifest.jsonl',
+                        help="Manifest index gambar yang akan dibangun ulang")
+    parser.add_argument('--dry-run', action='store_true', help="Tampilkan rencana tanpa memindahkan file")
+    args = parser.parse_args()
+
+    total = migrate(args.folder, dry_run=args.dry_run)
+    print(f"{total} file {'akan dipindahkan' if args.dry_run else 'dipindahkan'}")
+    if not args.dry_run:
+        index = FrameIndex(args.manifest)
+        index.build(args.folder)
+        print(f"Index gambar dibangun ulang: {len(index)} file")
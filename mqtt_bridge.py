@@ -0,0 +1,193 @@
+"""Bridge MQTT -> MongoDB untuk data sensor.
+
+ESP32 sudah publish setiap data ke Ubidots (/v1.6/devices/<device_label>).
+Jika publish itu diarahkan ke broker lokal yang meneruskannya ke Ubidots
+(mosquitto bridge, lihat README), bridge ini ikut subscribe ke topic yang sama,
+sehingga setiap data cukup dikirim sekali tanpa POST /api/sensor. Label
+perangkat di topic menjadi nama perangkat. Bridge memvalidasi data dengan aturan
+yang sama seperti /api/sensor (JSON atau format biner sensor_codec), lalu
+menyimpannya berkelompok (satu bulk write per batch) lewat antrian write-behind
+dan jalur simpan flask_app (rollup ikut diperbarui).
+
+Broker wajib memakai autentikasi: satu user per perangkat (user = label perangkat)
+di password_file mosquitto, dan ACL yang hanya mengizinkan perangkat publish ke
+/v1.6/devices/<user> miliknya (lihat README). Bridge hanya menerima label yang
+terdaftar di password_file tersebut dan menolak payload dengan "device" berbeda.
+
+    python mqtt_bridge.py --host localhost --port 1883 --username edunudge-bridge \\
+        --password <password> --password-file /etc/mosquitto/passwd
+
+Uji lokal dengan broker mosquitto (konfigurasi README tanpa bagian connection):
+    mosquitto_pub -t /v1.6/devices/kelas-7a -q 1 -u kelas-7a -P <password> \\
+        -m '{"temp":27.5,"hum":60,"light":70,"sound":35,"motion":0}'
+"""
+import argparse
+import json
+import signal
+import threading
+
+import paho.mqtt.client as mqtt
+from bson import ObjectId
+
+import flask_app
+from flask_app import build_sensor_document, decode_sensor_payload, has_required_fields
+from ingest_queue import WriteBehindQueue
+
+# ========== KONFIGURASI MQTT ==========
+MQTT_HOST = "localhost"
+MQTT_PORT = 1883
+MQTT_USERNAME = None          # User bridge di broker (ACL: read /v1.6/devices/+)
+MQTT_PASSWORD = None
+MQTT_PASSWORD_FILE = None     # password_file mosquitto, user terdaftar = label perangkat
+MQTT_TOPIC = "/v1.6/devices/+"  # Topic publish Ubidots, level terakhir = label perangkat
+MQTT_QOS = 1
+MQTT_CLIENT_ID = "edunudge-bridge"
+MQTT_KEEPALIVE = 60
+
+# ========== KONFIGURASI BATCH ==========
+BRIDGE_QUEUE_SIZE = 10000  # Kapasitas antrian di memori
+BRIDGE_BATCH_SIZE = 500    # Flush saat batch mencapai ukuran ini
+BRIDGE_MAX_AGE = 1.0       # Flush saat data tertua menunggu selama ini (detik)
+
+logger = flask_app.app.logger
+
+
+def load_device_users(path, exclude=()):
+    """Username di password_file mosquitto (satu baris `user:hash` per perangkat)"""
+    devices = set()
+    with open(path) as f:
+        for line in f:
+            line = line.strip()
+            if line and not line.startswith('#'):
+                devices.add(line.split(':', 1)[0])
+    return devices - set(exclude)
+
+
+class SensorBridge:
+    """Ubah pesan MQTT menjadi dokumen sensor dan masukkan ke antrian bulk write"""
+
+    def __init__(self, ingest_queue, topic=MQTT_TOPIC, devices=None):
+        self.ingest_queue = ingest_queue
+        self.topic = topic
+        # Label perangkat yang boleh mengirim data (None: tidak diperiksa)
+        self.devices = devices
+        self.received = 0
+        self.invalid = 0
+        self.rejected = 0
+        self._lock = threading.Lock()
+
+    def handle(self, topic, payload):
+        """Validasi satu pesan (JSON atau format biner sensor_codec).
+        Return jumlah data yang masuk antrian"""
+        with self._lock:
+            self.received += 1
+        # Nama perangkat dari topic; ACL broker memastikan hanya user dengan nama
+        # yang sama yang bisa publish ke topic ini
+        device = topic.rsplit('/', 1)[-1]
+        if self.devices is not None and device not in self.devices:
+            with self._lock:
+                self.rejected += 1
+            logger.warning(f"Pesan MQTT dari perangkat tidak terdaftar ditolak: {topic}")
+            return 0
+        try:
+            if payload.lstrip()[:1] == b'{':
+                readings = [json.loads(payload)]
+            else:
+                readings = decode_sensor_payload(payload, device)
+        except ValueError:
+            readings = [None]
+
+        queued = 0
+        for data in readings:
+            if not has_required_fields(data):
+                with self._lock:
+                    self.invalid += 1
+                logger.warning(f"Pesan MQTT tidak valid dari {topic}")
+                continue
+            if data.setdefault("device", device) != device:
+                with self._lock:
+                    self.rejected += 1
+                logger.warning(f"Pesan MQTT dari {topic} ditolak: device tidak sesuai topic")
+                continue
+            document = build_sensor_document(data)
+            document['_id'] = ObjectId()
+            if not self.ingest_queue.put(document):
+                logger.warning("Antrian MQTT penuh, data sensor dibuang")
+                continue
+            queued += 1
+        return queued
+
+    def on_connect(self, client, userdata, flags, reason_code, properties):
+        if reason_code.is_failure:
+            logger.error(f"Gagal terhubung ke broker MQTT: {reason_code}")
+            return
+        # Subscribe ulang setiap kali terhubung (termasuk setelah reconnect)
+        client.subscribe(self.topic, qos=MQTT_QOS)
+        logger.info(f"MQTT bridge terhubung, subscribe {self.topic}")
+
+    def on_message(self, client, userdata, message):
+        self.handle(message.topic, message.payload)
+
+    def stats(self):
+        with self._lock:
+            return {"received": self.received, "invalid": self.invalid, "rejected": self.rejected,
+                    **self.ingest_queue.stats()}
+
+
+def create_client(bridge, client_id=MQTT_CLIENT_ID, username=MQTT_USERNAME, password=MQTT_PASSWORD):
+    # Sesi persisten: pesan QoS 1 selama bridge mati disimpan broker dan dikirim saat tersambung lagi
+    client = mqtt.Client(mqtt.CallbackAPIVersion.VERSION2, client_id=client_id, clean_session=False)
+    if username:
+        client.username_pw_set(username, password)
+    client.on_connect = bridge.on_connect
+    client.on_message = bridge.on_message
+    client.reconnect_delay_set(min_delay=1, max_delay=30)
+    return client
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Bridge MQTT ke MongoDB untuk data sensor")
+    parser.add_argument('--host', default=MQTT_HOST, help="Host broker MQTT")
+    parser.add_argument('--port', type=int, default=MQTT_PORT, help="Port broker MQTT")
+    parser.add_argument('--username', default=MQTT_USERNAME)
+    parser.add_argument('--password', default=MQTT_PASSWORD)
+    parser.add_argument('--client-id', default=MQTT_CLIENT_ID)
+    parser.add_argument('--topic', default=MQTT_TOPIC, help="Topic data sensor (level terakhir = perangkat)")
+    parser.add_argument('--password-file', default=MQTT_PASSWORD_FILE,
+                        help="password_file mosquitto berisi satu user per perangkat")
+    args = parser.parse_args()
+    if not args.password_file:
+        parser.error("--password-file wajib diisi agar hanya perangkat terdaftar yang diterima")
+    devices = load_device_users(args.password_file, exclude={args.username})
+
+    # Koneksi MongoDB dan jalur simpan sama dengan flask_app (tanpa state gambar)
+    flask_app.load_config()
+    flask_app.connect_database()
+    ingest_queue = WriteBehindQueue(
+        flask_app.flush_sensor_queue,
+        max_size=BRIDGE_QUEUE_SIZE,
+        batch_size=BRIDGE_BATCH_SIZE,
+        max_age=BRIDGE_MAX_AGE,
+        logger=logger
+    )
+    bridge = SensorBridge(ingest_queue, args.topic, devices)
+    client = create_client(bridge, args.client_id, args.username, args.password)
+
+    def shutdown(signum, frame):
+        client.disconnect()
+    signal.signal(signal.SIGTERM, shutdown)
+    signal.signal(signal.SIGINT, shutdown)
+
+    ingest_queue.start()
+    try:
+        client.connect_async(args.host, args.port, keepalive=MQTT_KEEPALIVE)
+        client.loop_forever(retry_first_connection=True)
+    finally:
+        # Tulis sisa antrian sebelum keluar
+        ingest_queue.stop()
+        flask_app.close_database()
+        logger.info(f"MQTT bridge berhenti: {bridge.stats()}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,237 @@
+import bisect
+import glob
+import mmap
+import os
+import shutil
+import struct
+import threading
+import time
+
+# Satu record index per frame: frame_id, waktu simpan (epoch), offset, panjang, flags
+INDEX_RECORD = struct.Struct('<QdQIH')
+
+
+def segment_frame_name(segment_id, frame_id):
+    """Nama frame di segment store, dipakai sebagai `filename` di response API"""
+    return f"seg{segment_id:06d}-{frame_id:08d}"
+
+
+def _frame_id(name):
+    """frame_id dari nama frame, atau None jika nama tidak valid"""
+    try:
+        return int(name.split('-')[1])
+    except (IndexError, ValueError):
+        return None
+
+
+class SegmentStore:
+    """Penyimpanan frame append-only: JPEG ditambahkan ke file segment berukuran tetap.
+
+    Setiap segment terdiri dari seg_XXXXXX.dat (byte JPEG berurutan) dan
+    seg_XXXXXX.idx (record INDEX_RECORD per frame). Frame dibaca lewat mmap,
+    dan retensi cukup menghapus segment tertua utuh tanpa menghapus file satu per satu.
+    """
+
+    def __init__(self, folder, segment_size=16 * 1024 * 1024, max_bytes=100 * 1024 * 1024,
+                 low_water_ratio=0.8):
+        self.folder = folder
+        self.segment_size = segment_size
+        self.max_bytes = max_bytes
+        self.low_water_ratio = low_water_ratio
+        self.total_bytes = 0
+        self._entries = []      # Entri frame, urut sesuai urutan tulis
+        self._keys = []         # (created, frame_id) paralel dengan _entries
+        self._ids = []          # frame_id paralel dengan _entries (naik, untuk find)
+        self._segments = {}     # segment_id -> ukuran file .dat
+        self._maps = {}         # segment_id -> mmap yang sedang terbuka
+        self._active = None     # (segment_id, file .dat, file .idx)
+        self._next_frame_id = 1
+        self._lock = threading.Lock()
+        os.makedirs(folder, exist_ok=True)
+
+    def _paths(self, segment_id):
+        base = os.path.join(self.folder, f"seg_{segment_id:06d}")
+        return base + '.dat', base + '.idx'
+
+    def segment_path(self, segment_id):
+        """Path file data segment, dipakai pembaca lain (mis. dashboard) untuk mmap"""
+        return self._paths(segment_id)[0]
+
+    def open(self):
+        """Muat semua index segment dari disk dan pulihkan segment yang terpotong"""
+        with self._lock:
+            segment_ids = sorted(
+                int(os.path.basename(path)[4:10])
+                for path in glob.glob(os.path.join(self.folder, 'seg_*.idx'))
+            )
+            for segment_id in segment_ids:
+                data_path, index_path = self._paths(segment_id)
+                with open(index_path, 'rb') as f:
+                    raw = f.read()
+                # Abaikan record terakhir yang terpotong jika proses berhenti saat menulis
+                usable = len(raw) - len(raw) % INDEX_RECORD.size
+                end = 0
+                for frame_id, created, offset, length, flags in INDEX_RECORD.iter_unpack(raw[:usable]):
+                    self._append_entry(segment_id, frame_id, created, offset, length, flags)
+                    end = offset + length
+                    self._next_frame_id = max(self._next_frame_id, frame_id + 1)
+                # Byte data tanpa record index (tulis yang tidak selesai) dipotong
+                if os.path.exists(data_path) and os.path.getsize(data_path) > end:
+                    with open(data_path, 'r+b') as f:
+                        f.truncate(end)
+                if len(raw) != usable:
+                    with open(index_path, 'r+b') as f:
+                        f.truncate(usable)
+                self._segments[segment_id] = end
+                self.total_bytes += end
+            # Nama frame disajikan dengan cache immutable, jadi frame_id tidak boleh dipakai ulang
+            # meskipun semua segment sudah dihapus. Mulai dari waktu sekarang (milidetik).
+            self._next_frame_id = max(self._next_frame_id, int(time.time() * 1000))
+
+    def _append_entry(self, segment_id, frame_id, created, offset, length, flags):
+        self._entries.append({
+            "filename": segment_frame_name(segment_id, frame_id),
+            "size": length,
+            "created": created,
+            "segment": segment_id,
+            "offset": offset,
+            "length": length,
+            "flags": flags
+        })
+        self._keys.append((created, frame_id))
+        self._ids.append(frame_id)
+
+    def _roll_segment(self):
+        """Tutup segment aktif dan buat segment baru"""
+        if self._active:
+            self._active[1].close()
+            self._active[2].close()
+        segment_id = max(self._segments, default=0) + 1
+        data_path, index_path = self._paths(segment_id)
+        self._active = (segment_id, open(data_path, 'ab'), open(index_path, 'ab'))
+        self._segments[segment_id] = 0
+
+    def append(self, source, length, created, flags=0):
+        """Tambahkan satu frame. `source` berupa bytes atau file object yang bisa dibaca,
+        `flags` bitmask bebas milik pemanggil (mis. tag kualitas). Return entri frame."""
+        with self._lock:
+            if self._active is None or self._segments[self._active[0]] + length > self.segment_size:
+                if self._active is None and self._segments:
+                    # Lanjutkan segment terakhir setelah restart jika masih muat
+                    last_id = max(self._segments)
+                    if self._segments[last_id] + length <= self.segment_size:
+                        data_path, index_path = self._paths(last_id)
+                        self._active = (last_id, open(data_path, 'ab'), open(index_path, 'ab'))
+                if self._active is None or self._segments[self._active[0]] + length > self.segment_size:
+                    self._roll_segment()
+
+            segment_id, data_file, index_file = self._active
+            offset = self._segments[segment_id]
+            if isinstance(source, (bytes, bytearray, memoryview)):
+                data_file.write(source)
+            else:
+                shutil.copyfileobj(source, data_file, 64 * 1024)
+            data_file.flush()
+
+            frame_id = self._next_frame_id
+            self._next_frame_id += 1
+            # Record index ditulis setelah data, sehingga frame hanya terlihat jika datanya utuh
+            index_file.write(INDEX_RECORD.pack(frame_id, created, offset, length, flags))
+            index_file.flush()
+
+            self._segments[segment_id] = offset + length
+            self.total_bytes += length
+            self._append_entry(segment_id, frame_id, created, offset, length, flags)
+            return dict(self._entries[-1])
+
+    def read(self, entry):
+        """Baca byte frame lewat mmap segment"""
+        segment_id, offset, length = entry["segment"], entry["offset"], entry["length"]
+        with self._lock:
+            mapped = self._maps.get(segment_id)
+            if mapped is None or offset + length > len(mapped):
+                # Segment aktif bertambah panjang sejak di-mmap, petakan ulang
+                if mapped is not None:
+                    mapped.close()
+                data_path, _ = self._paths(segment_id)
+                with open(data_path, 'rb') as f:
+                    mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+                self._maps[segment_id] = mapped
+            return bytes(mapped[offset:offset + length])
+
+    def find(self, name):
+        """Cari entri berdasarkan nama frame (segXXXXXX-YYYYYYYY)"""
+        frame_id = _frame_id(name)
+        if frame_id is None:
+            return None
+        with self._lock:
+            # frame_id bertambah sesuai urutan tulis, jadi bisa dicari dengan bisect
+            index = bisect.bisect_left(self._ids, frame_id)
+            if index < len(self._ids) and self._ids[index] == frame_id:
+                return dict(self._entries[index])
+        return None
+
+    def latest(self):
+        with self._lock:
+            return dict(self._entries[-1]) if self._entries else None
+
+    def since(self, created, limit=100, after=None):
+        """Entri yang disimpan setelah waktu `created` (epoch detik), urut naik.
+        Jika `after` (nama frame) diisi, mulai tepat setelah frame tersebut."""
+        frame_id = _frame_id(after) if after is not None else None
+        with self._lock:
+            start = bisect.bisect_right(self._keys, (created, float('inf') if frame_id is None else frame_id))
+            return [dict(entry) for entry in self._entries[start:start + limit]]
+
+    def __len__(self):
+        return len(self._entries)
+
+    def enforce_retention(self):
+        """Jika melebihi batas, hapus segment tertua utuh sampai di bawah low_water_ratio.
+        Return daftar segment_id yang dihapus."""
+        removed = []
+        with self._lock:
+            if self.total_bytes <= self.max_bytes:
+                return removed
+            target = self.max_bytes * self.low_water_ratio
+            active_id = self._active[0] if self._active else None
+            for segment_id in sorted(self._segments):
+                if self.total_bytes <= target or segment_id == active_id:
+                    break
+                self._drop_segment(segment_id)
+                removed.append(segment_id)
+        return removed
+
+    def clear(self):
+        """Hapus semua segment"""
+        with self._lock:
+            if self._active:
+                self._active[1].close()
+                self._active[2].close()
+                self._active = None
+            for segment_id in list(self._segments):
+                self._drop_segment(segment_id)
+
+    def _drop_segment(self, segment_id):
+        mapped = self._maps.pop(segment_id, None)
+        if mapped is not None:
+            mapped.close()
+        for path in self._paths(segment_id):
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+        self.total_bytes -= self._segments.pop(segment_id)
+        # Entri segment tertua selalu berada di awal daftar
+        count = 0
+        while count < len(self._entries) and self._entries[count]["segment"] == segment_id:
+            count += 1
+        if count:
+            del self._entries[:count]
+            del self._keys[:count]
+            del self._ids[:count]
+        else:
+            keep = [i for i, entry in enumerate(self._entries) if entry["segment"] != segment_id]
+            self._entries = [self._entries[i] for i in keep]
+            self._keys = [self._keys[i] for i in keep]
+            self._ids = [self._ids[i] for i in keep]
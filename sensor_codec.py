@@ -0,0 +1,59 @@
+"""Format biner ringkas untuk data sensor.
+
+Satu data = 10 byte little-endian (versi, temp, hum, light, sound, motion),
+nilai desimal disimpan sebagai kelipatan 0.1. Beberapa data cukup
+disambung untuk /api/sensor/batch. Dikirim dengan
+Content-Type: application/x-edunudge-sensor.
+
+Modul ini juga dipakai firmware ESP32 (MicroPython), jadi hanya memakai
+struct/ustruct tanpa dependensi lain.
+"""
+try:
+    import struct
+except ImportError:  # MicroPython lama
+    import ustruct as struct
+
+CONTENT_TYPE = "application/x-edunudge-sensor"
+VERSION = 1
+# versi (B), temp x10 (h), hum x10 (H), light x10 (H), sound x10 (H), motion (B)
+RECORD_FORMAT = "<BhHHHB"
+RECORD_SIZE = struct.calcsize(RECORD_FORMAT)
+INT16_RANGE = (-32768, 32767)
+UINT16_RANGE = (0, 65535)
+
+
+def _scale(value, value_range):
+    """Nilai x10 sebagai int. Rentang dicek sendiri karena ustruct tidak punya
+    struct.error dan diam-diam membuang byte atas nilai yang terlalu besar."""
+    scaled = value * 10
+    low, high = value_range
+    # Dibandingkan sebelum dibulatkan; NaN juga gagal perbandingan ini
+    if not (low - 0.5 < scaled < high + 0.5):
+        raise ValueError("Nilai sensor di luar rentang format biner")
+    return round(scaled)
+
+
+def encode_reading(temp, hum, light, motion, sound):
+    """Bungkus satu data sensor menjadi RECORD_SIZE byte"""
+    return struct.pack(RECORD_FORMAT, VERSION, _scale(temp, INT16_RANGE), _scale(hum, UINT16_RANGE),
+                       _scale(light, UINT16_RANGE), _scale(sound, UINT16_RANGE), 1 if motion else 0)
+
+
+def decode_readings(data):
+    """Kebalikan encode_reading untuk satu atau lebih data yang disambung.
+    Return list dict dengan field yang sama seperti payload JSON."""
+    if not data or len(data) % RECORD_SIZE:
+        raise ValueError(f"Panjang payload harus kelipatan {RECORD_SIZE} byte")
+    readings = []
+    for offset in range(0, len(data), RECORD_SIZE):
+        version, temp, hum, light, sound, motion = struct.unpack_from(RECORD_FORMAT, data, offset)
+        if version != VERSION:
+            raise ValueError(f"Versi format biner tidak dikenal: {version}")
+        readings.append({
+            "temp": temp / 10,
+            "hum": hum / 10,
+            "light": light / 10,
+            "motion": motion,
+            "sound": sound / 10
+        })
+    return readings
@@ -0,0 +1,110 @@
+import logging
+import threading
+from collections import deque
+from datetime import datetime, timedelta
+
+
+class SensorFeed:
+    """Satu pintu publish data sensor baru ke cache terbaru dan event stream.
+
+    Data yang disimpan proses ini dipublish langsung lewat publish(). Data yang
+    ditulis proses lain (worker gunicorn lain, asgi_gateway, mqtt_bridge) diambil
+    thread poller dari database setiap `interval` detik. Setiap _id hanya
+    dipublish sekali, siapa pun yang melihatnya lebih dulu.
+    """
+
+    def __init__(self, fetch, publish, interval=1.0, lookback=timedelta(seconds=5),
+                 page_size=500, remember=10000, logger=None):
+        # fetch(start, after, limit): data dengan timestamp >= start, urut naik (timestamp, _id)
+        self.fetch = fetch
+        self.publish_func = publish
+        self.interval = interval
+        # Timestamp dibuat oleh penulis sebelum insert, jadi data bisa muncul di database
+        # sedikit setelah data yang lebih baru; poll selalu membaca ulang jendela ini
+        self.lookback = lookback
+        self.page_size = page_size
+        self.logger = logger or logging.getLogger(__name__)
+
+        self._seen = set()
+        self._seen_order = deque()
+        self._remember = remember
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._thread = None
+        self.high_water = None
+
+        # Counter untuk monitoring
+        self.published = 0
+        self.polled = 0
+        self.failed_polls = 0
+
+    def _claim(self, documents):
+        """Ambil dokumen yang belum pernah dipublish dan tandai sebagai sudah"""
+        fresh = []
+        for document in documents:
+            if document['_id'] in self._seen:
+                continue
+            self._seen.add(document['_id'])
+            self._seen_order.append(document['_id'])
+            fresh.append(document)
+        while len(self._seen_order) > self._remember:
+            self._seen.discard(self._seen_order.popleft())
+        return fresh
+
+    def publish(self, documents):
+        """Publish dokumen yang baru disimpan (dokumen yang sudah dipublish dilewati)"""
+        with self._lock:
+            fresh = self._claim(documents)
+            self.published += len(fresh)
+            if fresh:
+                self.publish_func(fresh)
+        return len(fresh)
+
+    def poll_once(self):
+        """Publish data baru dari database sejak poll sebelumnya, return jumlahnya"""
+        if self.high_water is None:
+            # Data sebelum feed berjalan sudah diambil cache saat cold start
+            self.high_water = datetime.now()
+        start = self.high_water - self.lookback
+        count = 0
+        after = None
+        while True:
+            page = self.fetch(start, after, self.page_size)
+            if page:
+                count += self.publish(page)
+                last = page[-1]
+                after = (last['timestamp'], last['_id'])
+                self.high_water = max(self.high_water, last['timestamp'])
+            if len(page) < self.page_size:
+                break
+        self.polled += count
+        return count
+
+    def start(self):
+        """Jalankan thread poller (aman dipanggil berulang kali)"""
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name="sensor-feed-poller", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout=5.0):
+        self._stop_event.set()
+        if self._thread:
+            self._thread.join(timeout)
+
+    def _run(self):
+        while not self._stop_event.wait(self.interval):
+            try:
+                self.poll_once()
+            except Exception as e:
+                self.failed_polls += 1
+                self.logger.error(f"Gagal membaca data sensor baru dari database: {str(e)}")
+
+    def stats(self):
+        return {
+            "published": self.published,
+            "polled": self.polled,
+            "failed_polls": self.failed_polls,
+            "running": bool(self._thread and self._thread.is_alive())
+        }
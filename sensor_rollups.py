@@ -0,0 +1,164 @@
+from datetime import timedelta
+
+from pymongo import UpdateOne
+
+# Field numerik yang dirangkum dan nama yang dipakai di response API
+ROLLUP_FIELDS = {
+    'temp': 'Temp',
+    'hum': 'Hum',
+    'light': 'Light',
+    'sound': 'Sound'
+}
+GRANULARITIES = ('minute', 'hour', 'day')
+PERIOD_LENGTHS = {
+    'minute': timedelta(minutes=1),
+    'hour': timedelta(hours=1),
+    'day': timedelta(days=1)
+}
+
+
+def truncate_period(timestamp, granularity):
+    """Potong timestamp ke awal periode menit/jam/hari"""
+    if granularity == 'minute':
+        return timestamp.replace(second=0, microsecond=0)
+    if granularity == 'hour':
+        return timestamp.replace(minute=0, second=0, microsecond=0)
+    if granularity == 'day':
+        return timestamp.replace(hour=0, minute=0, second=0, microsecond=0)
+    raise ValueError(f"Granularity tidak dikenal: {granularity}")
+
+
+def _to_number(value):
+    if isinstance(value, bool):
+        return int(value)
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def build_rollup_updates(documents):
+    """Kelompokkan dokumen per periode di memori lalu buat satu upsert per periode"""
+    groups = {}
+    for document in documents:
+        timestamp = document.get('timestamp')
+        if timestamp is None:
+            continue
+        for granularity in GRANULARITIES:
+            period = truncate_period(timestamp, granularity)
+            group = groups.setdefault((granularity, period), {
+                'count': 0, 'motion': 0, 'sum': {}, 'count_by': {}, 'min': {}, 'max': {}
+            })
+            group['count'] += 1
+            motion = _to_number(document.get('motion'))
+            group['motion'] += 1 if motion else 0
+            for field in ROLLUP_FIELDS:
+                value = _to_number(document.get(field))
+                if value is None:
+                    continue
+                group['sum'][field] = group['sum'].get(field, 0) + value
+                group['count_by'][field] = group['count_by'].get(field, 0) + 1
+                group['min'][field] = min(group['min'].get(field, value), value)
+                group['max'][field] = max(group['max'].get(field, value), value)
+
+    updates = []
+    for (granularity, period), group in groups.items():
+        inc = {'count': group['count'], 'motion_count': group['motion']}
+        set_min, set_max = {}, {}
+        for field, total in group['sum'].items():
+            inc[f'{field}.sum'] = total
+            inc[f'{field}.count'] = group['count_by'][field]
+            set_min[f'{field}.min'] = group['min'][field]
+            set_max[f'{field}.max'] = group['max'][field]
+        update = {
+            '$setOnInsert': {'granularity': granularity, 'period_start': period},
+            '$inc': inc
+        }
+        if set_min:
+            update['$min'] = set_min
+            update['$max'] = set_max
+        updates.append(UpdateOne(
+            {'_id': f"{granularity}:{period.isoformat()}"}, update, upsert=True
+        ))
+    return updates
+
+
+def apply_rollups(rollup_collection, documents):
+    """Perbarui dokumen rollup menit/jam/hari untuk dokumen sensor yang baru disimpan"""
+    updates = build_rollup_updates(documents)
+    if updates:
+        rollup_collection.bulk_write(updates, ordered=False)
+    return len(updates)
+
+
+async def apply_rollups_async(rollup_collection, documents):
+    """Sama seperti apply_rollups untuk koleksi AsyncMongoClient (asgi_gateway.py)"""
+    updates = build_rollup_updates(documents)
+    if updates:
+        await rollup_collection.bulk_write(updates, ordered=False)
+    return len(updates)
+
+
+def rebuild_rollups(rollup_collection, documents, batch_size=5000):
+    """Bangun ulang semua rollup dari data sensor yang sudah ada (sekali jalan)"""
+    rollup_collection.delete_many({})
+    batch = []
+    total = 0
+    for document in documents:
+        batch.append(document)
+        if len(batch) >= batch_size:
+            apply_rollups(rollup_collection, batch)
+            total += len(batch)
+            batch = []
+    if batch:
+        apply_rollups(rollup_collection, batch)
+        total += len(batch)
+    return total
+
+
+def _summarize(bucket):
+    """Ubah dokumen rollup menjadi rata-rata, min dan max per field"""
+    summary = {'count': bucket.get('count', 0), 'motionCount': bucket.get('motion_count', 0)}
+    for field, label in ROLLUP_FIELDS.items():
+        stats = bucket.get(field) or {}
+        count = stats.get('count', 0)
+        summary[f'avg{label}'] = stats['sum'] / count if count else None
+        summary[f'min{label}'] = stats.get('min')
+        summary[f'max{label}'] = stats.get('max')
+    return summary
+
+
+def query_rollups(rollup_collection, granularity, start=None, end=None):
+    """Ambil rollup dalam rentang waktu dan gabungkan menjadi ringkasan total.
+    Biaya query sebanding dengan jumlah periode di rentang, bukan jumlah data sensor.
+    `start` dibulatkan ke awal periode (periode yang memuat `start` ikut dihitung
+    utuh); bulatkan dulu dengan truncate_period jika pemanggil perlu melaporkannya."""
+    if granularity not in GRANULARITIES:
+        raise ValueError(f"Granularity harus salah satu dari: {', '.join(GRANULARITIES)}")
+
+    query = {'granularity': granularity}
+    period_filter = {}
+    if start is not None:
+        period_filter['$gte'] = truncate_period(start, granularity)
+    if end is not None:
+        period_filter['$lte'] = end
+    if period_filter:
+        query['period_start'] = period_filter
+
+    buckets = []
+    total = {'count': 0, 'motion_count': 0}
+    for bucket in rollup_collection.find(query).sort('period_start', 1):
+        total['count'] += bucket.get('count', 0)
+        total['motion_count'] += bucket.get('motion_count', 0)
+        for field in ROLLUP_FIELDS:
+            stats = bucket.get(field)
+            if not stats:
+                continue
+            merged = total.setdefault(field, {'sum': 0, 'count': 0})
+            merged['sum'] += stats.get('sum', 0)
+            merged['count'] += stats.get('count', 0)
+            merged['min'] = min(merged.get('min', stats['min']), stats['min'])
+            merged['max'] = max(merged.get('max', stats['max']), stats['max'])
+        buckets.append({'period': bucket['period_start'].isoformat(), **_summarize(bucket)})
+
+    return _summarize(total), buckets
@@ -0,0 +1,305 @@
+from datetime import timedelta
+
+from bson import ObjectId
+from pymongo import UpdateOne
+from pymongo.errors import BulkWriteError
+
+# Field yang disimpan per data sensor
+SENSOR_FIELDS = ['temp', 'hum', 'light', 'motion', 'sound']
+DEFAULT_DEVICE = "ESP32-Sensor"
+
+
+class DocumentSensorStore:
+    """Layout asli: satu dokumen MongoDB per data sensor"""
+
+    name = 'document'
+
+    def __init__(self, collection):
+        self.collection = collection
+
+    # Index gabungan untuk sort keyset (timestamp, _id); prefix timestamp juga
+    # dipakai latest() dan iter_range()
+    RANGE_INDEX = "timestamp_-1__id_-1"
+
+    def ensure_indexes(self):
+        if self.RANGE_INDEX not in self.collection.index_information():
+            self.collection.create_index([("timestamp", -1), ("_id", -1)], name=self.RANGE_INDEX)
+
+    def insert_one(self, document):
+        return self.collection.insert_one(document).inserted_id
+
+    def insert_many(self, documents):
+        """Simpan dengan satu bulk write tanpa urutan. Return {posisi: pesan error}"""
+        failed = {}
+        try:
+            self.collection.insert_many(documents, ordered=False)
+        except BulkWriteError as e:
+            for error in e.details.get('writeErrors', []):
+                failed[error['index']] = error.get('errmsg', 'Write failed')
+        return failed
+
+    async def insert_many_async(self, documents):
+        """Sama seperti insert_many, untuk koleksi AsyncMongoClient"""
+        failed = {}
+        try:
+            await self.collection.insert_many(documents, ordered=False)
+        except BulkWriteError as e:
+            for error in e.details.get('writeErrors', []):
+                failed[error['index']] = error.get('errmsg', 'Write failed')
+        return failed
+
+    def latest(self, limit=10):
+        return list(self.collection.find().sort("timestamp", -1).limit(limit))
+
+    def find_range(self, start=None, end=None, after=None, limit=100, fields=None, ascending=False):
+        """Ambil data dalam rentang waktu dengan pagination keyset (timestamp, _id).
+        `after` adalah (timestamp, _id) data terakhir di halaman sebelumnya."""
+        query = _range_filter('timestamp', start, end)
+        if after:
+            op = '$gt' if ascending else '$lt'
+            # Batas timestamp di level atas agar scan index dimulai dari cursor
+            bound = {'timestamp': {'$gte' if ascending else '$lte': after[0]}}
+            query = {'$and': [query, bound, {'$or': [
+                {'timestamp': {op: after[0]}},
+                {'timestamp': after[0], '_id': {op: after[1]}}
+            ]}]}
+        projection = None
+        if fields:
+            projection = {field: 1 for field in fields}
+            projection['timestamp'] = 1
+        direction = 1 if ascending else -1
+        cursor = (self.collection.find(query, projection)
+                  .sort([("timestamp", direction), ("_id", direction)])
+                  .hint(self.RANGE_INDEX)
+                  .limit(limit))
+        return list(cursor)
+
+    def iter_range(self, start=None, end=None, batch_size=1000):
+        """Iterasi data dalam rentang waktu (urut naik) tanpa memuat semuanya ke memori"""
+        return (self.collection.find(_range_filter('timestamp', start, end))
+                .sort("timestamp", 1)
+                .batch_size(batch_size))
+
+    def iter_documents(self, batch_size=5000):
+        return self.collection.find().batch_size(batch_size)
+
+    def is_empty(self):
+        return self.collection.estimated_document_count() == 0
+
+
+class BucketSensorStore:
+    """Layout bucket: satu dokumen per perangkat per periode waktu, nilai disimpan
+    sebagai array paralel sehingga nama field tidak diulang di setiap data.
+
+    Contoh dokumen:
+        {device, bucket_start, first_ts, last_ts, count,
+         ids: [...], timestamps: [...], temp: [...], hum: [...], ...}
+    """
+
+    name = 'bucket'
+
+    def __init__(self, collection, bucket_span=timedelta(hours=1), max_bucket_size=720):
+        self.collection = collection
+        self.bucket_span = bucket_span
+        self.max_bucket_size = max_bucket_size
+
+    def ensure_indexes(self):
+        self.collection.create_index([("device", 1), ("bucket_start", 1)], name="device_1_bucket_start_1")
+        self.collection.create_index([("last_ts", -1)], name="last_ts_-1")
+        # Sort find_range (urut naik) dan iter_range
+        self.collection.create_index([("first_ts", 1)], name="first_ts_1")
+
+    def bucket_start(self, timestamp):
+        """Awal bucket untuk timestamp (dibulatkan ke bawah sesuai bucket_span)"""
+        span = int(self.bucket_span.total_seconds())
+        midnight = timestamp.replace(hour=0, minute=0, second=0, microsecond=0)
+        offset = int((timestamp - midnight).total_seconds()) // span * span
+        return midnight + timedelta(seconds=offset)
+
+    def _build_updates(self, documents):
+        """Kelompokkan dokumen per (device, bucket) lalu buat satu upsert $push per kelompok.
+        Return (updates, posisi dokumen untuk setiap update)."""
+        groups = {}
+        for position, document in enumerate(documents):
+            document.setdefault('_id', ObjectId())
+            device = document.get('device', DEFAULT_DEVICE)
+            key = (device, self.bucket_start(document['timestamp']))
+            groups.setdefault(key, []).append(position)
+
+        updates, positions = [], []
+        for (device, bucket_start), members in groups.items():
+            for start in range(0, len(members), self.max_bucket_size):
+                chunk = members[start:start + self.max_bucket_size]
+                chunk_docs = [documents[i] for i in chunk]
+                push = {
+                    'ids': {'$each': [doc['_id'] for doc in chunk_docs]},
+                    'timestamps': {'$each': [doc['timestamp'] for doc in chunk_docs]}
+                }
+                for field in SENSOR_FIELDS:
+                    push[field] = {'$each': [doc.get(field) for doc in chunk_docs]}
+                updates.append(UpdateOne(
+                    # Bucket yang tidak muat untuk seluruh chunk tidak cocok dengan filter,
+                    # sehingga upsert membuat bucket baru dan count tidak melewati batas
+                    {'device': device, 'bucket_start': bucket_start,
+                     'count': {'$lte': self.max_bucket_size - len(chunk_docs)}},
+                    {
+                        '$push': push,
+                        '$inc': {'count': len(chunk_docs)},
+                        '$min': {'first_ts': min(doc['timestamp'] for doc in chunk_docs)},
+                        '$max': {'last_ts': max(doc['timestamp'] for doc in chunk_docs)}
+                    },
+                    upsert=True
+                ))
+                positions.append(chunk)
+        return updates, positions
+
+    def insert_one(self, document):
+        failed = self.insert_many([document])
+        if failed:
+            raise RuntimeError(failed[0])
+        return document['_id']
+
+    def insert_many(self, documents):
+        """Simpan dengan satu bulk write tanpa urutan. Return {posisi: pesan error}"""
+        updates, positions = self._build_updates(documents)
+        failed = {}
+        try:
+            self.collection.bulk_write(updates, ordered=False)
+        except BulkWriteError as e:
+            for error in e.details.get('writeErrors', []):
+                for position in positions[error['index']]:
+                    failed[position] = error.get('errmsg', 'Write failed')
+        return failed
+
+    async def insert_many_async(self, documents):
+        """Sama seperti insert_many, untuk koleksi AsyncMongoClient"""
+        updates, positions = self._build_updates(documents)
+        failed = {}
+        try:
+            await self.collection.bulk_write(updates, ordered=False)
+        except BulkWriteError as e:
+            for error in e.details.get('writeErrors', []):
+                for position in positions[error['index']]:
+                    failed[position] = error.get('errmsg', 'Write failed')
+        return failed
+
+    @staticmethod
+    def unpack(bucket):
+        """Ubah satu bucket menjadi daftar dokumen sensor seperti layout asli"""
+        documents = []
+        for i, reading_id in enumerate(bucket.get('ids', [])):
+            document = {
+                '_id': reading_id,
+                'timestamp': bucket['timestamps'][i],
+                'device': bucket['device'],
+                'device_type': DEFAULT_DEVICE
+            }
+            for field in SENSOR_FIELDS:
+                values = bucket.get(field, [])
+                document[field] = values[i] if i < len(values) else None
+            documents.append(document)
+        return documents
+
+    def latest(self, limit=10):
+        """Ambil data terbaru dari bucket dengan last_ts terbesar"""
+        readings = []
+        cursor = self.collection.find().sort("last_ts", -1)
+        for bucket in cursor:
+            # Bucket berikutnya tidak mungkin berisi data yang lebih baru dari yang sudah terkumpul
+            if len(readings) >= limit and bucket['last_ts'] < readings[limit - 1]['timestamp']:
+                break
+            readings.extend(self.unpack(bucket))
+            readings.sort(key=lambda doc: doc['timestamp'], reverse=True)
+        return readings[:limit]
+
+    def find_range(self, start=None, end=None, after=None, limit=100, fields=None, ascending=False):
+        """Sama seperti DocumentSensorStore.find_range, dibaca dari bucket yang beririsan"""
+        if after:
+            if ascending:
+                start = max(start, after[0]) if start else after[0]
+            else:
+                end = min(end, after[0]) if end else after[0]
+        query = {}
+        if start is not None:
+            query['last_ts'] = {'$gte': start}
+        if end is not None:
+            query['first_ts'] = {'$lte': end}
+        if after:
+            # Satu bucket mencakup kurang dari bucket_span, jadi bucket yang masih bisa berisi
+            # data setelah cursor berada dalam satu bucket_span dari cursor. Batas ini membuat
+            # halaman dalam tidak memindai ulang semua bucket sebelum cursor.
+            if ascending:
+                query.setdefault('first_ts', {})['$gt'] = after[0] - self.bucket_span
+            else:
+                query.setdefault('last_ts', {})['$lt'] = after[0] + self.bucket_span
+        sort_key = 'first_ts' if ascending else 'last_ts'
+
+        def in_page(doc):
+            key = (doc['timestamp'], doc['_id'])
+            if start is not None and doc['timestamp'] < start:
+                return False
+            if end is not None and doc['timestamp'] > end:
+                return False
+            if after:
+                return key > tuple(after) if ascending else key < tuple(after)
+            return True
+
+        readings = []
+        for bucket in self.collection.find(query).sort(sort_key, 1 if ascending else -1):
+            # Bucket berikutnya hanya berisi data di luar halaman ini
+            if len(readings) >= limit:
+                boundary = readings[limit - 1]['timestamp']
+                if (ascending and bucket['first_ts'] > boundary) or (not ascending and bucket['last_ts'] < boundary):
+                    break
+            readings.extend(doc for doc in self.unpack(bucket) if in_page(doc))
+            readings.sort(key=lambda doc: (doc['timestamp'], doc['_id']), reverse=not ascending)
+        readings = readings[:limit]
+        if fields:
+            keep = set(fields) | {'_id', 'timestamp'}
+            readings = [{k: v for k, v in doc.items() if k in keep} for doc in readings]
+        return readings
+
+    def iter_range(self, start=None, end=None, batch_size=1000):
+        """Iterasi data dalam rentang waktu (urut naik per bucket)"""
+        query = {}
+        if start is not None:
+            query['last_ts'] = {'$gte': start}
+        if end is not None:
+            query['first_ts'] = {'$lte': end}
+        buckets = (self.collection.find(query)
+                   .sort("first_ts", 1)
+                   .batch_size(max(1, batch_size // self.max_bucket_size)))
+        for bucket in buckets:
+            for document in self.unpack(bucket):
+                if start is not None and document['timestamp'] < start:
+                    continue
+                if end is not None and document['timestamp'] > end:
+                    continue
+                yield document
+
+    def iter_documents(self, batch_size=5000):
+        buckets = self.collection.find().sort("bucket_start", 1).batch_size(max(1, batch_size // self.max_bucket_size))
+        for bucket in buckets:
+            yield from self.unpack(bucket)
+
+    def is_empty(self):
+        return self.collection.estimated_document_count() == 0
+
+
+def _range_filter(field, start, end):
+    query = {}
+    if start is not None:
+        query.setdefault(field, {})['$gte'] = start
+    if end is not None:
+        query.setdefault(field, {})['$lte'] = end
+    return query
+
+
+def create_sensor_store(db, mode='document'):
+    """Buat penyimpanan sensor sesuai mode ('document' atau 'bucket')"""
+    if mode == 'document':
+        return DocumentSensorStore(db['sensor_data'])
+    if mode == 'bucket':
+        return BucketSensorStore(db['sensor_buckets'])
+    raise ValueError(f"Mode penyimpanan sensor tidak dikenal: {mode}")
+
@@ -0,0 +1,96 @@
+import heapq
+import os
+import threading
+
+
+class StorageLedger:
+    """Catatan penyimpanan gambar di memori: total byte dan heap file tertua.
+
+    Folder hanya di-scan sekali saat build(); setelah itu ledger diperbarui
+    setiap kali file ditulis atau dihapus, sehingga keputusan penghapusan
+    cukup O(log n) per file tanpa listdir/getsize di setiap upload.
+    """
+
+    def __init__(self, folder, max_bytes, low_water_ratio=0.8):
+        self.folder = folder
+        self.max_bytes = max_bytes
+        self.low_water_ratio = low_water_ratio
+        self.total_bytes = 0
+        self._sizes = {}   # path -> ukuran file (byte)
+        self._heap = []    # (mtime, path), entri yang sudah dihapus dilewati saat pop
+        self._lock = threading.Lock()
+
+    def build(self):
+        """Scan folder sekali untuk mengisi ledger"""
+        with self._lock:
+            self._sizes.clear()
+            self._heap = []
+            self.total_bytes = 0
+            for root, _, filenames in os.walk(self.folder):
+                for filename in filenames:
+                    path = os.path.join(root, filename)
+                    try:
+                        stat = os.stat(path)
+                    except OSError:
+                        continue
+                    self._sizes[path] = stat.st_size
+                    self._heap.append((stat.st_mtime, path))
+                    self.total_bytes += stat.st_size
+            heapq.heapify(self._heap)
+
+    def add(self, path, size=None, created=None):
+        """Catat file baru yang sudah ditulis ke disk"""
+        if size is None or created is None:
+            stat = os.stat(path)
+            size = stat.st_size if size is None else size
+            created = stat.st_mtime if created is None else created
+        with self._lock:
+            self.total_bytes += size - self._sizes.get(path, 0)
+            self._sizes[path] = size
+            heapq.heappush(self._heap, (created, path))
+
+    def discard(self, path):
+        """Hapus file dari catatan (file sudah dihapus dari disk)"""
+        with self._lock:
+            self.total_bytes -= self._sizes.pop(path, 0)
+            self._maybe_compact()
+
+    def file_count(self):
+        with self._lock:
+            return len(self._sizes)
+
+    def needs_eviction(self):
+        return self.total_bytes > self.max_bytes
+
+    def evict(self, on_error=None):
+        """Jika melebihi batas, hapus file tertua sampai di bawah low_water_ratio.
+        Return daftar path yang dihapus."""
+        evicted = []
+        with self._lock:
+            if self.total_bytes <= self.max_bytes:
+                return evicted
+            target = self.max_bytes * self.low_water_ratio
+            while self.total_bytes > target and self._heap:
+                _, path = heapq.heappop(self._heap)
+                if path not in self._sizes:
+                    continue  # Entri lama dari file yang sudah dihapus/ditimpa
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    pass  # Sudah dihapus dari luar, cukup keluarkan dari ledger
+                except OSError as e:
+                    if on_error:
+                        on_error(path, e)
+                    continue
+                # Ukuran diambil dari ledger, bukan getsize() pada file yang sudah dihapus
+                self.total_bytes -= self._sizes.pop(path)
+                evicted.append(path)
+            self._maybe_compact()
+        return evicted
+
+    def _maybe_compact(self):
+        """Buang entri heap yang sudah tidak valid jika jumlahnya terlalu banyak"""
+        if len(self._heap) <= 2 * len(self._sizes) + 64:
+            return
+        self._heap = [(created, path) for created, path in self._heap if path in self._sizes]
+        heapq.heapify(self._heap)
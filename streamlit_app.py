@@ -307,27 +307,93 @@ class GeminiRecommendationEngine:
             return [f"⚠️ Error dalam menghasilkan rekomendasi: {str(e)}"]
 
 # ========== FUNGSI BANTUAN ==========
+# Cache lokal gambar yang diunduh dari /api/camera/frames. Nama frame unik dan isinya
+# tidak berubah, jadi gambar yang sudah ada di cache tidak diunduh ulang.
+FRAME_CACHE_DIR = os.path.join("static", "frame_cache")
+FRAME_CACHE_MAX_FILES = 200
+
+@st.cache_resource
+def get_http_cache():
+    """Session HTTP dan ETag + body terakhir per URL, dipakai bersama semua sesi dashboard"""
+    return {"session": requests.Session(), "validators": {}}
+
+def conditional_get(url, timeout):
+    """GET dengan If-None-Match. Return (status, data JSON); 304 memakai data tersimpan"""
+    cache = get_http_cache()
+    cached = cache["validators"].get(url)
+    headers = {"If-None-Match": cached["etag"]} if cached else {}
+    response = cache["session"].get(url, headers=headers, timeout=timeout)
+    if response.status_code == 304 and cached:
+        return 200, cached["data"]
+    if response.status_code != 200:
+        return response.status_code, None
+    data = response.json()
+    if response.headers.get("ETag"):
+        cache["validators"][url] = {"etag": response.headers["ETag"], "data": data}
+    return 200, data
+
 @st.cache_data(ttl=10)
 def fetch_sensor_data(server_url):
     try:
-        res = requests.get(f"{server_url}/api/sensor/latest", timeout=3)
-        return res.json()["data"] if res.status_code == 200 else []
+        status, data = conditional_get(f"{server_url}/api/sensor/latest", timeout=3)
+        return data["data"] if status == 200 else []
     except:
         return []
 
+def download_frame(server_url, url):
+    """Unduh gambar ke cache lokal (sekali per frame), return path file JPEG"""
+    name = url.rsplit('/api/camera/frames/', 1)[-1].replace('/', '_')
+    cache_path = os.path.abspath(os.path.join(FRAME_CACHE_DIR, os.path.splitext(name)[0] + '.jpg'))
+    if os.path.exists(cache_path):
+        return cache_path
+    
+    os.makedirs(FRAME_CACHE_DIR, exist_ok=True)
+    response = get_http_cache()["session"].get(f"{server_url}{url}", timeout=10, stream=True)
+    response.raise_for_status()
+    temp_path = f"{cache_path}.{os.getpid()}.tmp"
+    with open(temp_path, 'wb') as f:
+        for chunk in response.iter_content(64 * 1024):
+            f.write(chunk)
+    os.replace(temp_path, cache_path)
+    
+    # Batasi jumlah file cache, hapus yang paling lama
+    cached = sorted(
+        (entry for entry in os.scandir(FRAME_CACHE_DIR) if entry.name.endswith('.jpg')),
+        key=lambda entry: entry.stat().st_mtime
+    )
+    for entry in cached[:-FRAME_CACHE_MAX_FILES]:
+        try:
+            os.remove(entry.path)
+        except OSError:
+            pass
+    return cache_path
+
 @st.cache_data(ttl=10)
 def fetch_latest_image(server_url):
     try:
-        response = requests.get(f"{server_url}/api/camera/latest", timeout=5)
-        if response.status_code == 200:
-            data = response.json()
-            filename = os.path.basename(data['path'])
-            filepath = os.path.abspath(os.path.join("static", "uploads", filename))
-            return filepath, data.get('timestamp', '')
+        status, data = conditional_get(f"{server_url}/api/camera/latest", timeout=5)
+        if status == 200:
+            # Gambar diambil lewat HTTP, jadi dashboard bisa berjalan di host lain.
+            # Untuk frame duplikat, url menunjuk gambar yang dirujuk.
+            return download_frame(server_url, data['url']), data
     except Exception as e:
         st.sidebar.error(f"Koneksi ke server gagal: {str(e)}")
-    return None, None
+    return None, {}
 
+@st.cache_data(max_entries=64, show_spinner=False)
+def fetch_frame_bytes(server_url, url):
+    """Ambil gambar turunan (thumbnail/preview) dari server. Nama frame unik, jadi aman di-cache"""
+    try:
+        response = get_http_cache()["session"].get(f"{server_url}{url}", timeout=5)
+        if response.status_code == 200:
+            return response.content
+    except Exception:
+        pass
+    return None
+
+# Hasil analisis di-cache per path gambar: frame duplikat yang tidak disimpan ulang
+# (atau dicatat sebagai rujukan) tidak dianalisis DeepFace lagi
+@st.cache_data(max_entries=32, show_spinner=False)
 def analyze_faces(img_path, detection_model, min_confidence):
     try:
         results = DeepFace.analyze(
@@ -480,7 +546,9 @@ with tab2:
     st.markdown("## 🎭 Monitoring Emosi Siswa")
     st.caption("Realtime monitoring ekspresi wajah menggunakan ESP32-CAM dan DeepFace")
 
-    img_path, timestamp = fetch_latest_image(SERVER_URL)
+    img_path, frame = fetch_latest_image(SERVER_URL)
+    timestamp = frame.get('timestamp', '')
+    quality_issues = frame.get('quality', [])  # Tag masalah kualitas (gelap, terlalu terang, blur)
 
     if img_path:
         retries = 3
@@ -489,8 +557,9 @@ with tab2:
             retries -= 1
 
         if os.path.exists(img_path):
-            img = Image.open(img_path)
-            img_np = np.array(img)
+            # Tampilan memakai preview kecil dari server; gambar penuh hanya di-decode jika ada wajah
+            preview_url = frame.get('derivatives', {}).get('preview')
+            preview = fetch_frame_bytes(SERVER_URL, preview_url) if preview_url else None
 
             # ===== Dua Kolom Tampilan =====
             st.markdown('<div class="card">', unsafe_allow_html=True)
@@ -500,13 +569,21 @@ with tab2:
 
             with col1:
                 st.markdown('<div class="image-container">', unsafe_allow_html=True)
-                st.image(img_np, caption=f"Gambar Terkini - {timestamp}", use_container_width=True)
+                st.image(preview if preview is not None else img_path,
+                         caption=f"Gambar Terkini - {timestamp}", use_container_width=True)
                 st.markdown('</div>', unsafe_allow_html=True)
 
-            with st.spinner("🔍 Menganalisis wajah..."):
-                results = analyze_faces(img_path, detection_model, min_confidence)
+            if quality_issues:
+                # Gambar gelap/blur/terlalu terang tidak dianalisis agar CPU tidak terbuang
+                st.warning(f"⚠️ Kualitas gambar kurang baik ({', '.join(quality_issues)}), analisis wajah dilewati")
+                results = []
+            else:
+                with st.spinner("🔍 Menganalisis wajah..."):
+                    results = analyze_faces(img_path, detection_model, min_confidence)
 
             if results:
+                img = Image.open(img_path)
+                img_np = np.array(img)
                 # Visualisasi deteksi wajah yang lebih baik
                 img_bboxes = visualize_detection(img_np, results)
 
@@ -543,7 +620,7 @@ with tab2:
                                     
                                     col_face, col_info = st.columns([1, 2])
                                     with col_face:
-                                        st.image(face_crop, use_container_width=True, output_format="PNG")
+                                        st.image(face_crop, use_container_width=True, output_format="JPEG")
                                     
                                     with col_info:
                                         st.markdown(f"""
@@ -0,0 +1,99 @@
+"""Data yang ditulis mqtt_bridge (proses lain) harus sampai ke /api/sensor/latest dan /api/stream.
+
+    python -m pytest tests
+"""
+import json
+import os
+import sys
+
+import pytest
+
+mongomock = pytest.importorskip("mongomock")
+pytest.importorskip("paho.mqtt.client")
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import flask_app  # noqa: E402
+import mqtt_bridge  # noqa: E402
+from event_stream import EventBroadcaster  # noqa: E402
+from latest_cache import LatestReadingsCache  # noqa: E402
+from sensor_feed import SensorFeed  # noqa: E402
+
+READING = {"temp": 27.5, "hum": 60, "light": 70, "sound": 35, "motion": 0}
+
+
+class CollectingQueue:
+    """Pengganti WriteBehindQueue: simpan dokumen untuk ditulis oleh test"""
+
+    def __init__(self):
+        self.documents = []
+
+    def put(self, document):
+        self.documents.append(document)
+        return True
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(flask_app, "MongoClient", mongomock.MongoClient)
+    app = flask_app.create_app({"RATELIMIT_ENABLED": False, "SENSOR_POLL_INTERVAL": 0})
+    # State per test: cache, event stream dan feed baru di atas database kosong
+    flask_app.sensor_store.collection.delete_many({})
+    monkeypatch.setattr(flask_app, "latest_cache", LatestReadingsCache())
+    monkeypatch.setattr(flask_app, "events", EventBroadcaster())
+    monkeypatch.setattr(flask_app, "sensor_feed", SensorFeed(
+        flask_app.fetch_new_sensor_documents, flask_app.publish_sensor_documents))
+    return app.test_client()
+
+
+def write_from_bridge(topic, reading):
+    """Jalur mqtt_bridge sampai MongoDB, tanpa publish di proses web ini"""
+    ingest_queue = CollectingQueue()
+    bridge = mqtt_bridge.SensorBridge(ingest_queue)
+    assert bridge.handle(topic, json.dumps(reading).encode()) == 1
+    assert flask_app.sensor_store.insert_many(ingest_queue.documents) == {}
+    return ingest_queue.documents[0]
+
+
+def test_bridge_reading_reaches_latest_and_stream(client):
+    first = client.get('/api/sensor/latest')
+    assert first.status_code == 200
+    assert first.get_json()["count"] == 0
+
+    document = write_from_bridge('/v1.6/devices/kelas-7a', READING)
+    assert flask_app.sensor_feed.poll_once() == 1
+
+    response = client.get('/api/sensor/latest', headers={'If-None-Match': first.headers['ETag']})
+    assert response.status_code == 200
+    assert response.headers['ETag'] != first.headers['ETag']
+    data = response.get_json()["data"]
+    assert [item["_id"] for item in data] == [str(document["_id"])]
+    assert data[0]["device"] == "kelas-7a"
+
+    events = [(event, data) for _, event, data in flask_app.events.replay]
+    assert [(event, data["_id"]) for event, data in events] == [("sensor", str(document["_id"]))]
+
+
+def test_local_and_polled_reading_published_once(client):
+    response = client.post('/api/sensor', json=READING, headers={'X-API-KEY': 'EduNudgeAI'})
+    assert response.status_code in (200, 201)
+    # Poller melihat data yang sama di database, tapi sudah dipublish oleh proses ini
+    assert flask_app.sensor_feed.poll_once() == 0
+    assert len(flask_app.events.replay) == 1
+
+
+def test_bridge_rejects_unregistered_and_mismatched_devices():
+    ingest_queue = CollectingQueue()
+    bridge = mqtt_bridge.SensorBridge(ingest_queue, devices={"kelas-7a"})
+    assert bridge.handle('/v1.6/devices/kelas-7b', json.dumps(READING).encode()) == 0
+    assert bridge.handle('/v1.6/devices/kelas-7a', json.dumps({**READING, "device": "kelas-7b"}).encode()) == 0
+    assert bridge.handle('/v1.6/devices/kelas-7a', json.dumps(READING).encode()) == 1
+    assert bridge.rejected == 2
+    assert [document["device"] for document in ingest_queue.documents] == ["kelas-7a"]
+
+
+def test_load_device_users(tmp_path):
+    password_file = tmp_path / "passwd"
+    password_file.write_text("edunudge-bridge:$7$101$abc\nkelas-7a:$7$101$def\n\nkelas-7b:$7$101$ghi\n")
+    assert mqtt_bridge.load_device_users(password_file, exclude={"edunudge-bridge"}) == {"kelas-7a", "kelas-7b"}
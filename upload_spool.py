@@ -0,0 +1,99 @@
+import glob
+import os
+import tempfile
+
+from werkzeug.exceptions import RequestEntityTooLarge
+
+TEMP_PREFIX = '.upload_'
+TEMP_SUFFIX = '.part'
+
+
+class SpooledUpload:
+    """File sementara di folder upload yang ditulis per chunk saat data diterima.
+
+    Ukuran dicek di setiap write, sehingga upload yang terlalu besar langsung
+    dihentikan tanpa pernah menampung seluruh gambar di memori. Setelah valid,
+    commit() memindahkan file ke lokasi akhir secara atomik (os.replace).
+    """
+
+    def __init__(self, folder, max_bytes):
+        fd, self.path = tempfile.mkstemp(dir=folder, prefix=TEMP_PREFIX, suffix=TEMP_SUFFIX)
+        self._file = os.fdopen(fd, 'w+b')
+        self.max_bytes = max_bytes
+        self.size = 0
+        self.finished = False
+
+    def write(self, data):
+        self.size += len(data)
+        if self.size > self.max_bytes:
+            raise RequestEntityTooLarge(f"Ukuran gambar melebihi {self.max_bytes // (1024 * 1024)}MB")
+        return self._file.write(data)
+
+    def read(self, *args):
+        return self._file.read(*args)
+
+    def seek(self, *args):
+        return self._file.seek(*args)
+
+    def tell(self):
+        return self._file.tell()
+
+    def flush(self):
+        self._file.flush()
+
+    def close(self):
+        self._file.close()
+
+    def seekable(self):
+        return True
+
+    def readable(self):
+        return True
+
+    def writable(self):
+        return True
+
+    def commit(self, destination):
+        """Tutup file lalu pindahkan ke lokasi akhir secara atomik"""
+        self._file.close()
+        os.replace(self.path, destination)
+        self.finished = True
+
+    def discard(self):
+        """Hapus file sementara (aman dipanggil berulang kali)"""
+        if self.finished:
+            return
+        self._file.close()
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
+        self.finished = True
+
+
+def spool_stream(stream, folder, max_bytes, chunk_size=65536):
+    """Salin body request ke SpooledUpload per chunk"""
+    upload = SpooledUpload(folder, max_bytes)
+    try:
+        while True:
+            chunk = stream.read(chunk_size)
+            if not chunk:
+                break
+            upload.write(chunk)
+        upload.flush()
+    except BaseException:
+        upload.discard()
+        raise
+    return upload
+
+
+def remove_stale_uploads(folder):
+    """Hapus file sementara yang tertinggal jika server berhenti saat upload"""
+    removed = 0
+    for path in glob.glob(os.path.join(folder, f"{TEMP_PREFIX}*{TEMP_SUFFIX}")):
+        try:
+            os.remove(path)
+            removed += 1
+        except OSError:
+            pass
+    return removed
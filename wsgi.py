@@ -0,0 +1,11 @@
+"""Entry point WSGI untuk produksi dengan beberapa proses worker.
+
+    gunicorn -c gunicorn.conf.py wsgi:app
+
+Setiap worker memanggil create_app() setelah fork sehingga koneksi MongoDB,
+thread write-behind dan pool worker turunan dibuat per proses. Inisialisasi
+database dan backup dijalankan sekali di proses master (gunicorn.conf.py).
+"""
+from flask_app import create_app
+
+app = create_app({"MULTI_PROCESS": True})